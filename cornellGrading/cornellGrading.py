@@ -1,4 +1,3 @@
-import pandas
 import numpy as np
 import getpass
 import keyring
@@ -7,23 +6,29 @@ from datetime import datetime, timedelta
 import pytz
 import canvasapi
 from canvasapi import Canvas
-from canvasapi.exceptions import InvalidAccessToken
+from canvasapi.exceptions import (
+    CanvasException,
+    InvalidAccessToken,
+    ResourceDoesNotExist,
+)
 import tempfile
+import io
 import os
+import json
+import threading
 import re
+import random
 import warnings
-from cornellGrading.cornellQualtrics import cornellQualtrics
+from concurrent.futures import Future, ThreadPoolExecutor
+from cornellGrading.cornellQualtrics import cornellQualtrics, rateLimitRetry
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
 import urllib.parse
 import subprocess
 import shutil
-import requests
 import uuid
-from cornellGrading.utils import convalllatex
-
-try:
-    from cornellGrading.pandocHTMLParser import pandocHTMLParser
-except ImportError:
-    pass
+import hashlib
+from cornellGrading.utils import convalllatex, readSurveyCSV
 
 
 class cornellGrading:
@@ -36,6 +41,40 @@ class cornellGrading:
 
     """
 
+    # tokens retrieved during this session, keyed by canvas url, so that repeated
+    # instantiations don't go back to the system keychain
+    tokenCache = {}
+
+    # pytz timezone objects, keyed by name, for localizeTime
+    timezones = {}
+
+    # latex2html patterns, compiled once. texSubs replace tex commands that Canvas
+    # can't handle, and htmlSubs reformat pandoc output for Canvas. Each set of
+    # substitutions is applied in a single pass via one combined pattern.
+    texInputPattern = re.compile(r"\\input{([^}]+)}")
+    texSubs = {
+        r"\nicefrac": r"\frac",
+        r"\ensuremath": r"",
+        r"\leftmoon": r"\mathrm{Moon}",
+        r"\Venus": r"Venus",
+    }
+    texSubPattern = re.compile("|".join(re.escape(k) for k in texSubs))
+    webtexPattern = re.compile(r'src="https://latex.codecogs.com/png.latex\?(.*?)"')
+    htmlSubs = [
+        (
+            r'class="math display"',
+            r'style="display: block; text-align: center; margin: 0.5rem auto;"',
+        ),
+        (r'img[\s]*style="vertical-align:middle"', r'img class="equation_image"'),
+        (
+            r'src="https://latex.codecogs.com/png.latex\?',
+            r'src="https://canvas.cornell.edu/equation_images/',
+        ),
+        (r"<figcaption", '<figcaption style="text-align: center;"'),
+    ]
+    htmlSubPattern = re.compile("|".join("({})".format(k) for k, _ in htmlSubs))
+    stylePattern = re.compile(r'style="([\S]*)?(?=")"')
+
     def __init__(self, canvasurl="https://canvas.cornell.edu", canvas_token_file=None):
         """Ask for token, store it if you can connect, and
         save resulting canvas object
@@ -61,7 +100,9 @@ class cornellGrading:
 
         """
 
-        token = keyring.get_password("canvas_test_token1", "canvas")
+        token = cornellGrading.tokenCache.get(canvasurl)
+        if token is None:
+            token = keyring.get_password("canvas_test_token1", "canvas")
         if token is None:
             if canvas_token_file is None:
                 token = getpass.getpass("Enter canvas token:\n")
@@ -73,16 +114,41 @@ class cornellGrading:
                 canvas = Canvas(canvasurl, token)
                 canvas.get_current_user()
                 keyring.set_password("canvas_test_token1", "canvas", token)
+                cornellGrading.tokenCache[canvasurl] = token
                 print("Connected.  Token Saved")
             except InvalidAccessToken:
                 print("Could not connect. Token not saved.")
         else:
             canvas = Canvas(canvasurl, token)
             canvas.get_current_user()
+            cornellGrading.tokenCache[canvasurl] = token
             print("Connected to Canvas.")
 
         self.canvas = canvas
 
+        # canvasapi makes all requests through a single requests.Session. Size its
+        # connection pool for the concurrent helpers (createAssignments, etc.) and
+        # retry idempotent requests on gateway errors. Note that Canvas throttles
+        # with a 403 (Rate Limit Exceeded) rather than a 429, so throttled requests
+        # are not retried here; the 429 entry only covers proxies that use it.
+        canvas._Canvas__requester._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=rateLimitRetry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 502, 503, 504],
+                    raise_on_status=False,
+                ),
+            ),
+        )
+
+        # for polling asynchronous Canvas jobs in the background (created on first
+        # use by uploadScoresAsync and shut down by waitAll)
+        self.uploadExecutor = None
+
     def listCourses(self):
         """Returns a list of courses
 
@@ -94,7 +160,7 @@ class cornellGrading:
                     Matched ordered list of course numbers (int list)
         """
 
-        crss = self.canvas.get_courses()
+        crss = self.canvas.get_courses(per_page=100)
 
         courseStrs = []
         courseNums = []
@@ -104,7 +170,7 @@ class cornellGrading:
 
         return courseStrs, courseNums
 
-    def getCourse(self, coursenum):
+    def getCourse(self, coursenum, useGraphQL=True, useCache=False, cacheTTL=3600):
         """Access course and load all student names, ids and netids
 
         Args:
@@ -116,6 +182,20 @@ class cornellGrading:
 
                     >>> c = cornellGrading.cornellGrading()
                     >>> for cn in c.canvas.get_courses(): print(cn)
+            useGraphQL (bool):
+                Load the roster via a single Canvas GraphQL query rather than paging
+                through the REST users endpoint (defaults True).  If the GraphQL
+                query fails, the REST endpoint is used instead.
+            useCache (bool):
+                Load the roster from an on-disk cache if one exists (defaults False).
+                See :py:meth:`cornellGrading.cornellGrading.rosterCacheFile`.
+                This also persists the ids of assignments, assignment groups and
+                folders found by name, so that later runs can fetch them directly.
+                See :py:meth:`cornellGrading.cornellGrading.loadCourseMetadata`.
+            cacheTTL (float):
+                Age (in seconds) after which a cached roster is refreshed. A stale
+                roster is still used, but is refreshed in the background for the next
+                run. Defaults to 3600.
 
         Returns:
             None
@@ -126,15 +206,87 @@ class cornellGrading:
 
         # get the course
         course = self.canvas.get_course(coursenum)
-        tmp = course.get_users(include=["enrollments", "test_student"])
+
+        roster = None
+        if useCache:
+            roster, fetched = self.loadRosterCache(coursenum)
+            if (roster is not None) and (time.time() - fetched > cacheTTL):
+                threading.Thread(
+                    target=self.saveRosterCache,
+                    args=(coursenum, course, useGraphQL),
+                    daemon=True,
+                ).start()
+
+        if roster is None:
+            roster = self.getRoster(course, coursenum, useGraphQL=useGraphQL)
+            if useCache:
+                self.saveRosterCache(coursenum, roster=roster)
+
+        names, ids, netids = roster
+
+        self.course = course
+        self.names = np.array(names)
+        self.ids = np.array(ids)
+        self.netids = np.array(netids)
+        self.netid2id = dict(zip(netids, ids))
+        self.id2netid = dict(zip(ids, netids))
+
+        # (first name, last name, email) for each student, for mailing lists
+        self.contacts = []
+        for n, nid in zip(names, netids):
+            lastName, _, firstName = n.partition(", ")
+            self.contacts.append((firstName, lastName, nid + "@cornell.edu"))
+
+        # per-course lookup caches
+        self.clearCache()
+        if useCache:
+            self.courseMetadata = self.loadCourseMetadata(coursenum)
+        else:
+            self.courseMetadata = None
+        self.courseMetadataLock = threading.Lock()
+
+        self.coursename = course.name
+
+    def getRoster(self, course, coursenum, useGraphQL=True):
+        """Load student names, ids and netids from Canvas
+
+        Args:
+            course (canvasapi.course.Course):
+                Course object
+            coursenum (int):
+                Canvas course number
+            useGraphQL (bool):
+                Try the Canvas GraphQL API first (defaults True), falling back to the
+                REST users endpoint on failure.
+
+        Returns:
+            tuple:
+                names (list):
+                    Student sortable names (str list)
+                ids (list):
+                    Student Canvas user ids (int list)
+                netids (list):
+                    Student netids (str list)
+
+        """
+
+        if useGraphQL:
+            try:
+                return self.getStudentsGraphQL(coursenum)
+            except (CanvasException, RequestException, AssertionError) as e:
+                print(f"GraphQL roster query failed ({e}). Falling back to REST.")
+
+        tmp = course.get_users(include=["enrollments", "test_student"], per_page=100)
         names = []
         ids = []
         netids = []
         for t in tmp:
-            isstudent = False
-            for e in t.enrollments:
-                if e["course_id"] == coursenum:
-                    isstudent = e["role"] == "StudentEnrollment"
+            # users may have several enrollments (e.g., multiple sections or roles)
+            # so keep anyone with at least one student enrollment in this course
+            isstudent = any(
+                (e["course_id"] == coursenum) and (e["role"] == "StudentEnrollment")
+                for e in t.enrollments
+            )
 
             if isstudent:
                 if not hasattr(t, "login_id"):
@@ -149,16 +301,339 @@ class cornellGrading:
                 ids.append(t.id)
                 netids.append(t.login_id)
 
-        names = np.array(names)
-        ids = np.array(ids)
-        netids = np.array(netids)
+        return names, ids, netids
 
-        self.course = course
-        self.names = names
-        self.ids = ids
-        self.netids = netids
+    def cacheFile(self, filename):
+        """Full path to an on-disk cache file
 
-        self.coursename = course.name
+        Args:
+            filename (str):
+                Name of cache file
+
+        Returns:
+            str:
+                Path to cache file. Cache files are stored in
+                ~/.cache/cornellGrading (or $XDG_CACHE_HOME/cornellGrading).
+
+        """
+
+        cachedir = os.path.join(
+            os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache")),
+            "cornellGrading",
+        )
+
+        return os.path.join(os.path.expanduser(cachedir), filename)
+
+    def writeCacheFile(self, cachefile, data):
+        """Write JSON data to an on-disk cache file
+
+        Args:
+            cachefile (str):
+                Full path to cache file
+            data (dict):
+                JSON-serializable data to write
+
+        Returns:
+            None
+
+        """
+
+        os.makedirs(os.path.dirname(cachefile), exist_ok=True)
+
+        # write to a temporary file and then move, so readers never see partial data
+        tmpfile = f"{cachefile}.{os.getpid()}.{threading.get_ident()}"
+        with open(tmpfile, "w") as f:
+            json.dump(data, f)
+        os.replace(tmpfile, cachefile)
+
+    def rosterCacheFile(self, coursenum):
+        """Full path to on-disk roster cache for a course
+
+        Args:
+            coursenum (int):
+                Canvas course number
+
+        Returns:
+            str:
+                Path to cache file. See
+                :py:meth:`cornellGrading.cornellGrading.cacheFile`.
+
+        """
+
+        return self.cacheFile(f"roster_{coursenum}.json")
+
+    def loadRosterCache(self, coursenum):
+        """Load course roster from on-disk cache
+
+        Args:
+            coursenum (int):
+                Canvas course number
+
+        Returns:
+            tuple:
+                roster (tuple):
+                    names, ids, netids lists, or None if there is no usable cache
+                fetched (float):
+                    Time (epoch seconds) that the cached roster was fetched
+
+        """
+
+        cachefile = self.rosterCacheFile(coursenum)
+        if not os.path.exists(cachefile):
+            return None, 0
+
+        try:
+            with open(cachefile, "r") as f:
+                cache = json.load(f)
+            roster = (cache["names"], cache["ids"], cache["netids"])
+            fetched = float(cache["fetched"])
+        except (ValueError, KeyError, TypeError):
+            return None, 0
+
+        return roster, fetched
+
+    def saveRosterCache(self, coursenum, course=None, useGraphQL=True, roster=None):
+        """Write course roster to on-disk cache
+
+        Args:
+            coursenum (int):
+                Canvas course number
+            course (canvasapi.course.Course):
+                Course object. Only needed if roster is None.
+            useGraphQL (bool):
+                Passed to :py:meth:`cornellGrading.cornellGrading.getRoster`
+            roster (tuple):
+                names, ids, netids lists to save.  If None (default) the roster is
+                fetched from Canvas.
+
+        Returns:
+            None
+
+        """
+
+        if roster is None:
+            roster = self.getRoster(course, coursenum, useGraphQL=useGraphQL)
+        names, ids, netids = roster
+
+        self.writeCacheFile(
+            self.rosterCacheFile(coursenum),
+            {
+                "fetched": time.time(),
+                "names": list(names),
+                "ids": [int(i) for i in ids],
+                "netids": list(netids),
+            },
+        )
+
+    def loadCourseMetadata(self, coursenum):
+        """Load persisted ids of assignments, groups, folders and uploads for a course
+
+        Args:
+            coursenum (int):
+                Canvas course number
+
+        Returns:
+            dict:
+                Dictionary with keys "assignments", "assignmentGroups", "folders" and
+                "uploads", each mapping object names to Canvas ids.
+
+        Notes:
+            Persisted ids are only used to fetch objects directly.  If a fetched
+            object no longer exists or has been renamed, its entry is dropped and
+            the object is looked up by name as usual.
+
+        """
+
+        metadata = {
+            "assignments": {},
+            "assignmentGroups": {},
+            "folders": {},
+            "uploads": {},
+        }
+
+        cachefile = self.cacheFile(f"course_{coursenum}.json")
+        if os.path.exists(cachefile):
+            try:
+                with open(cachefile, "r") as f:
+                    cache = json.load(f)
+                for kind in metadata:
+                    metadata[kind].update(cache[kind])
+            except (ValueError, KeyError):
+                pass
+
+        return metadata
+
+    def persistId(self, kind, name, obj):
+        """Persist (or forget) the Canvas id of a named course object
+
+        Args:
+            kind (str):
+                One of "assignments", "assignmentGroups" or "folders"
+            name (str):
+                Object name
+            obj (object):
+                Canvas object whose id to store, or None to forget the name
+
+        Returns:
+            None
+
+        Notes:
+            Does nothing unless the course was loaded with useCache=True
+
+        """
+
+        if self.courseMetadata is None:
+            return
+
+        # objects may be created from several threads (see createAssignments)
+        with self.courseMetadataLock:
+            if obj is None:
+                if self.courseMetadata[kind].pop(name, None) is None:
+                    return
+            else:
+                if self.courseMetadata[kind].get(name) == obj.id:
+                    return
+                self.courseMetadata[kind][name] = obj.id
+
+            self.writeCacheFile(
+                self.cacheFile(f"course_{self.course.id}.json"), self.courseMetadata
+            )
+
+    def getPersisted(self, kind, name, getter):
+        """Fetch a named course object directly by its persisted Canvas id
+
+        Args:
+            kind (str):
+                One of "assignments", "assignmentGroups" or "folders"
+            name (str):
+                Object name
+            getter (callable):
+                Function taking a Canvas id and returning the object
+
+        Returns:
+            object:
+                The Canvas object, or None if there is no valid persisted id
+
+        """
+
+        if self.courseMetadata is None or name not in self.courseMetadata[kind]:
+            return None
+
+        try:
+            obj = getter(self.courseMetadata[kind][name])
+        except ResourceDoesNotExist:
+            obj = None
+
+        if obj is None or obj.name != name:
+            self.persistId(kind, name, None)
+            return None
+
+        return obj
+
+    def clearCache(self):
+        """Forget all assignments, assignment groups and folders found so far
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Notes:
+            Use this if course contents have been changed outside of this object.
+            Persisted ids are kept, as they are validated against Canvas on use.
+
+        """
+
+        self.assignments = {}
+        self.assignmentGroups = {}
+        self.folders = {}
+        self.subFolders = {}
+
+    def getStudentsGraphQL(self, coursenum):
+        """Load student names, ids and netids via the Canvas GraphQL API
+
+        Args:
+            coursenum (int):
+                Canvas course number to access.
+
+        Returns:
+            tuple:
+                names (list):
+                    Student sortable names (str list)
+                ids (list):
+                    Student Canvas user ids (int list)
+                netids (list):
+                    Student netids (str list)
+
+        Notes:
+            Enrollments are requested in pages of 100, so this requires one request
+            per 100 enrollments rather than one per 10 users as in the REST API.
+            Only active and invited enrollments are included, and students are
+            sorted by sortable name, matching the REST users endpoint.
+
+        """
+
+        query = """
+            query courseRoster($courseId: ID!, $after: String) {
+              course(id: $courseId) {
+                enrollmentsConnection(
+                  first: 100
+                  after: $after
+                  filter: {states: [active, invited]}
+                ) {
+                  nodes {
+                    type
+                    user {
+                      _id
+                      sortableName
+                      loginId
+                    }
+                  }
+                  pageInfo {
+                    hasNextPage
+                    endCursor
+                  }
+                }
+              }
+            }
+        """
+
+        variables = {"courseId": str(coursenum), "after": None}
+        students = {}
+        while True:
+            res = self.canvas.graphql(query, variables=variables)
+            assert "errors" not in res, res.get("errors")
+            assert res["data"]["course"] is not None, "Could not find course."
+
+            conn = res["data"]["course"]["enrollmentsConnection"]
+            for node in conn["nodes"]:
+                if node["type"] != "StudentEnrollment" or node["user"] is None:
+                    continue
+                user = node["user"]
+                if not user["loginId"]:
+                    print(
+                        (
+                            f"Warning: Skipping {user['sortableName']}: "
+                            "is in the course, but not enrolled."
+                        )
+                    )
+                    continue
+                # students in multiple sections have multiple enrollments
+                students[int(user["_id"])] = (user["sortableName"], user["loginId"])
+
+            if not conn["pageInfo"]["hasNextPage"]:
+                break
+            variables["after"] = conn["pageInfo"]["endCursor"]
+
+        # match the REST users endpoint, which returns users ordered by sortable name
+        students = sorted(students.items(), key=lambda s: s[1][0].lower())
+
+        names = [s[1][0] for s in students]
+        ids = [s[0] for s in students]
+        netids = [s[1][1] for s in students]
+
+        return names, ids, netids
 
     def localizeTime(self, duedate, duetime="17:00:00", tz="US/Eastern"):
         """Helper method for setting the proper UTC time while being
@@ -177,7 +652,10 @@ class cornellGrading:
                 A time object. tzinfo will be <UTC>!
 
         """
-        local = pytz.timezone(tz)
+        local = cornellGrading.timezones.get(tz)
+        if local is None:
+            local = pytz.timezone(tz)
+            cornellGrading.timezones[tz] = local
         naive = datetime.strptime(duedate + " " + duetime, "%Y-%m-%d %H:%M:%S")
         local_dt = local.localize(naive, is_dst=None)
         utc_dt = local_dt.astimezone(pytz.utc)
@@ -195,7 +673,7 @@ class cornellGrading:
                     Matched ordered list of assignment IDs (int list)
         """
 
-        asgns = self.course.get_assignments()
+        asgns = self.course.get_assignments(per_page=100)
 
         asgnNames = []
         asgnIDs = []
@@ -205,7 +683,7 @@ class cornellGrading:
 
         return asgnNames, asgnIDs
 
-    def getAssignment(self, assignmentName):
+    def getAssignment(self, assignmentName, renew=False):
         """Locate assignment by name
 
         Args:
@@ -213,6 +691,9 @@ class cornellGrading:
                 Name of assignment to return.  Must be exact match.
                 To see all assignments do:
                 >> for a in c.course.get_assignments(): print(a)
+            renew (bool):
+                Look the assignment up again even if it has already been found in
+                this session (default False)
 
         Returns:
             canvasapi.assignment.Assignment:
@@ -220,18 +701,73 @@ class cornellGrading:
 
         """
 
-        tmp = self.course.get_assignments(search_term=assignmentName)
+        hw = self.findAssignment(assignmentName, renew=renew)
+        assert hw is not None, "Could not find assignment."
+
+        return hw
+
+    def findAssignment(self, assignmentName, renew=False):
+        """Locate assignment by name, if it exists
+
+        Args:
+            assignmentName (str):
+                Name of assignment to return.  Must be exact match.
+            renew (bool):
+                Look the assignment up again even if it has already been found in
+                this session (default False)
+
+        Returns:
+            canvasapi.assignment.Assignment:
+                The Assignment object, or None if there is no such assignment
+
+        """
+
+        if not renew and assignmentName in self.assignments:
+            return self.assignments[assignmentName]
+
         hw = None
-        for t in tmp:
-            if t.name == assignmentName:
-                hw = t
-                break
+        if not renew:
+            hw = self.getPersisted(
+                "assignments", assignmentName, self.course.get_assignment
+            )
 
-        assert hw is not None, "Could not find assignment."
+        if hw is None:
+            tmp = self.course.get_assignments(search_term=assignmentName, per_page=100)
+            for t in tmp:
+                if t.name == assignmentName:
+                    hw = t
+                    break
+
+            if hw is None:
+                return None
+            self.persistId("assignments", assignmentName, hw)
+
+        self.assignments[assignmentName] = hw
 
         return hw
 
-    def getAssignmentGroup(self, groupName):
+    def listAssignmentGroups(self):
+        """Grab and store all assignment groups in the course
+
+        Args:
+            None
+
+        Returns:
+            dict:
+                Assignment group objects keyed by group name.  If multiple groups
+                share a name, only the first is kept.
+
+        """
+
+        groups = {}
+        for t in self.course.get_assignment_groups(per_page=100):
+            groups.setdefault(t.name, t)
+
+        self.assignmentGroups = groups
+
+        return groups
+
+    def getAssignmentGroup(self, groupName, renew=False):
         """Locate assignment group by name
 
         Args:
@@ -239,6 +775,9 @@ class cornellGrading:
                 Name of assignment group to return.  Must be exact match.
                 To see all assignments do:
                 >> for a in c.course.get_assignment_groups(): print(a)
+            renew (bool):
+                Renew stored list of assignment groups (default False). The stored
+                list is always renewed if groupName is not found in it.
 
         Returns:
             canvasapi.assignment.AssignmentGroup:
@@ -246,41 +785,76 @@ class cornellGrading:
 
         """
 
-        tmp = self.course.get_assignment_groups()
-        group = None
-        for t in tmp:
-            if t.name == groupName:
-                group = t
-                break
+        if not renew and groupName not in self.assignmentGroups:
+            group = self.getPersisted(
+                "assignmentGroups", groupName, self.course.get_assignment_group
+            )
+            if group is not None:
+                self.assignmentGroups[groupName] = group
 
-        assert group is not None, "Could not find assignment group %s" % groupName
+        if renew or groupName not in self.assignmentGroups:
+            self.listAssignmentGroups()
+
+        assert groupName in self.assignmentGroups, (
+            "Could not find assignment group %s" % groupName
+        )
+
+        group = self.assignmentGroups[groupName]
+        self.persistId("assignmentGroups", groupName, group)
 
         return group
 
-    def createAssignmentGroup(self, groupName):
+    def createAssignmentGroup(self, groupName, renew=True):
         """Create assignment group by name
 
         Args:
             groupName (str):
                 Name of assignment group to create. Cannot be name of existing group
+            renew (bool):
+                Renew stored list of assignment groups before checking that
+                groupName does not already exist (default True).
 
         Returns:
             canvasapi.assignment.AssignmentGroup:
                 The assignment group object
 
         """
-        tmp = self.course.get_assignment_groups()
-        currGroups = [t.name for t in tmp]
+        if renew:
+            self.listAssignmentGroups()
 
-        assert groupName not in currGroups, (
+        assert groupName not in self.assignmentGroups, (
             "Assignment group %s already exists" % groupName
         )
 
         group = self.course.create_assignment_group(name=groupName)
+        self.assignmentGroups[groupName] = group
+        self.persistId("assignmentGroups", groupName, group)
 
         return group
 
-    def getFolder(self, folderName):
+    def getOrCreateAssignmentGroup(self, groupName):
+        """Locate assignment group by name, creating it if it does not exist
+
+        Args:
+            groupName (str):
+                Name of assignment group to return or create.  Must be exact match.
+
+        Returns:
+            canvasapi.assignment.AssignmentGroup:
+                The assignment group object
+
+        Notes:
+            The list of assignment groups is fetched at most once.
+
+        """
+
+        try:
+            return self.getAssignmentGroup(groupName)
+        except AssertionError:
+            # getAssignmentGroup has just renewed the stored list
+            return self.createAssignmentGroup(groupName, renew=False)
+
+    def getFolder(self, folderName, renew=False):
         """Locate folder by name
 
         Args:
@@ -288,6 +862,9 @@ class cornellGrading:
                 Name of folder to return.  Must be exact match.
                 To see all folders do:
                 >> for a in c.course.get_folders(): print(a.name)
+            renew (bool):
+                Renew stored list of folders (default False). The stored list is
+                always renewed if folderName is not found in it.
 
         Returns:
             canvasapi.folder.Folder:
@@ -295,14 +872,21 @@ class cornellGrading:
 
         """
 
-        tmp = self.course.get_folders()
-        folder = None
-        for t in tmp:
-            if t.name == folderName:
-                folder = t
-                break
+        if not renew and folderName not in self.folders:
+            folder = self.getPersisted("folders", folderName, self.course.get_folder)
+            if folder is not None:
+                self.folders[folderName] = folder
+
+        if renew or folderName not in self.folders:
+            folders = {}
+            for t in self.course.get_folders(per_page=100):
+                folders.setdefault(t.name, t)
+            self.folders = folders
 
-        assert folder is not None, "Could not find folder %s" % folderName
+        assert folderName in self.folders, "Could not find folder %s" % folderName
+
+        folder = self.folders[folderName]
+        self.persistId("folders", folderName, folder)
 
         return folder
 
@@ -335,29 +919,86 @@ class cornellGrading:
 
         """
 
-        # recurse down any paths given
+        # recurse down any paths given, using the returned folder as the parent
         if "/" in folderName:
             folders = folderName.split("/")
-            _ = self.createFolder(
+            parent = self.createFolder(
                 "/".join(folders[:-1]), parentFolder=parentFolder, hidden=hidden
             )
-            parentFolder = folders[-2]
             folderName = folders[-1]
+        else:
+            parent = self.getFolder(parentFolder)
 
-        parent = self.getFolder(parentFolder)
-        tmp = parent.get_folders()
-        subFolders = [t.name for t in tmp]
+        # subfolders are only listed once per parent
+        if parent.id not in self.subFolders:
+            subFolders = {}
+            for t in parent.get_folders(per_page=100):
+                subFolders.setdefault(t.name, t)
+            self.subFolders[parent.id] = subFolders
+        subFolders = self.subFolders[parent.id]
 
         if folderName in subFolders:
             # print("Folder %s already exists"%folderName)
-            return tmp[int(np.where(np.array(subFolders) == folderName)[0][0])]
+            return subFolders[folderName]
 
         folder = self.course.create_folder(
             folderName, parent_folder_id=str(parent.id), hidden=hidden
         )
+        subFolders[folderName] = folder
+        if folderName not in self.folders:
+            self.folders[folderName] = folder
+            self.persistId("folders", folderName, folder)
 
         return folder
 
+    def uploadFile(self, folder, fname):
+        """Upload a file to a folder, unless the same file is already there
+
+        Args:
+            folder (canvasapi.folder.Folder):
+                Folder to upload to
+            fname (str):
+                Full path to file
+
+        Returns:
+            dict:
+                Canvas file attributes, including id, url and filename
+
+        Notes:
+            Uploads are identified by folder, filename and SHA-256 hash of the file
+            contents, and are remembered along with other persisted ids (so only when
+            the course was loaded with useCache=True).
+
+        """
+
+        with open(fname, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        name = "{}/{}/{}".format(folder.id, os.path.basename(fname), digest)
+
+        if self.courseMetadata is not None and name in self.courseMetadata["uploads"]:
+            try:
+                upfile = self.course.get_file(self.courseMetadata["uploads"][name])
+                if upfile.folder_id == folder.id:
+                    return {
+                        "id": upfile.id,
+                        "url": upfile.url,
+                        "filename": upfile.filename,
+                    }
+            except ResourceDoesNotExist:
+                pass
+
+        res = folder.upload(fname)
+        assert res[0], "File upload failed: %s" % fname
+
+        if self.courseMetadata is not None:
+            with self.courseMetadataLock:
+                self.courseMetadata["uploads"][name] = res[1]["id"]
+                self.writeCacheFile(
+                    self.cacheFile(f"course_{self.course.id}.json"), self.courseMetadata
+                )
+
+        return res[1]
+
     def createAssignment(
         self,
         name,
@@ -440,9 +1081,34 @@ class cornellGrading:
             assignment["external_tool_tag_attributes"] = external_tool_tag_attributes
 
         res = self.course.create_assignment(assignment=assignment)
+        self.assignments[res.name] = res
+        self.persistId("assignments", res.name, res)
 
         return res
 
+    def createAssignments(self, assignments, maxWorkers=8):
+        """Create multiple assignments concurrently
+
+        Args:
+            assignments (list):
+                List of dicts of keyword arguments to
+                :py:meth:`cornellGrading.cornellGrading.createAssignment`.
+                Each must include at least name and groupid.
+            maxWorkers (int):
+                Maximum number of simultaneous requests (default 8)
+
+        Returns:
+            list:
+                canvasapi.assignment.Assignment objects, in the same order as the
+                inputs
+
+        """
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = [executor.submit(self.createAssignment, **a) for a in assignments]
+
+        return [f.result() for f in futures]
+
     def listPages(self):
         """List all pages in course
 
@@ -455,7 +1121,7 @@ class cornellGrading:
 
         """
 
-        pgs = self.course.get_pages()
+        pgs = self.course.get_pages(per_page=100)
 
         pages = []
         for pg in pgs:
@@ -476,7 +1142,7 @@ class cornellGrading:
 
         """
 
-        tmp = self.course.get_pages()
+        tmp = self.course.get_pages(per_page=100)
         pg = None
         for t in tmp:
             if t.title == title:
@@ -588,11 +1254,10 @@ class cornellGrading:
         if insertPDF:
             # grab the folder
             upfolder = self.createFolder(folder, hidden=hidden)
-            res = upfolder.upload(fname)
-            assert res[0], "File upload failed."
+            res = self.uploadFile(upfolder, fname)
 
-            upurl = res[1]["url"]
-            upfname = res[1]["filename"]
+            upurl = res["url"]
+            upfname = res["filename"]
             upepoint = upurl.split("/download")[0]
 
             body = (
@@ -643,54 +1308,64 @@ class cornellGrading:
             errors.
         """
 
+        import pandas
+
         duedate = self.localizeTime(duedate)
 
         name = "MATLAB " + str(assignmentNum)
-        try:
-            ass = self.getAssignment(name)
-        except AssertionError:
+        ass = self.findAssignment(name)
+        if ass is None:
             mg = self.getAssignmentGroup("MATLAB Assignments")
             ass = self.createAssignment(name, mg.id)
 
-        # process grader output
-        grader = pandas.read_csv(gradercsv)
+        # process grader output (only the columns used for scoring)
+        grader = pandas.read_csv(
+            gradercsv,
+            usecols=[
+                "Submitted Time",
+                "Student Email",
+                "Tests Passed",
+                "Total Tests",
+                "Problem Title",
+                "Late Submission?",
+            ],
+            dtype={
+                "Submitted Time": str,
+                "Student Email": str,
+                "Tests Passed": float,
+                "Total Tests": float,
+                "Problem Title": str,
+                "Late Submission?": str,
+            },
+        )
 
         # on windows, EDT/EST aren't in time.tzname, so we're going to
-        # parse the grader timestring manually and then force localization
-        timep = re.compile(r"(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2}) \S*")
-        timetmp = []
-        for t in grader["Submitted Time"]:
-            tmp = timep.match(t)
-            timetmp.append(self.localizeTime(tmp.groups()[0], duetime=tmp.groups()[1]))
-
-        emails = grader["Student Email"].values
-        testspassed = grader["Tests Passed"].values.astype(float)
-        tottests = grader["Total Tests"].values.astype(float)
-        probs = grader["Problem Title"].values
-        subtimes = np.array([(duedate - t).total_seconds() for t in timetmp])
+        # parse the grader timestring without the zone and then force localization
+        timetmp = pandas.to_datetime(
+            grader["Submitted Time"].str.extract(
+                r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})", expand=False
+            ),
+            format="%Y-%m-%d %H:%M:%S",
+        )
+        timetmp = timetmp.dt.tz_localize(
+            "US/Eastern", ambiguous="raise", nonexistent="raise"
+        ).dt.tz_convert("UTC")
+
+        subtimes = (pandas.Timestamp(duedate) - timetmp).dt.total_seconds().values
         islate = grader["Late Submission?"].values == "Y"
 
-        uprobs = np.unique(probs)
-        uemails = np.unique(emails)
-
-        netids = np.array([e.split("@")[0] for e in uemails])
-        scores = np.zeros(netids.size)
-        for prob in uprobs:
-            tottest = np.max(tottests[probs == prob])
-            pscores = testspassed[probs == prob] / tottest
-            pscores[
-                (subtimes[probs == prob] < -5 * 60.0) & (islate[probs == prob])
-            ] -= 0.25
-            pscores[
-                (subtimes[probs == prob] < -5 * 60.0 - 3 * 86400.0)
-                & (islate[probs == prob])
-            ] = 0
-            pscores[pscores < 0] = 0
-            pemails = emails[probs == prob]
-            for e, s in zip(pemails, pscores):
-                scores[uemails == e] += s
-
-        scores *= 10.0 / len(uprobs)
+        # score each submission against the max number of tests for its problem
+        tottests = grader.groupby("Problem Title")["Total Tests"].transform("max")
+        pscores = grader["Tests Passed"].values / tottests.values
+        late = (subtimes < -5 * 60.0) & islate
+        verylate = (subtimes < -5 * 60.0 - 3 * 86400.0) & islate
+        pscores = np.where(late, pscores - 0.25, pscores)
+        pscores = np.where(verylate, 0.0, pscores).clip(min=0)
+
+        # sum over problems for each student
+        pscores = pandas.Series(pscores).groupby(grader["Student Email"].values).sum()
+        netids = np.array([e.split("@")[0] for e in pscores.index])
+        scores = pscores.values * 10.0 / grader["Problem Title"].nunique()
 
         self.uploadScores(ass, netids, scores)
 
@@ -712,6 +1387,30 @@ class cornellGrading:
             uplaoded.
         """
 
+        self.waitAll([self.uploadScoresAsync(ass, netids, scores)])
+        print("Done.")
+
+    def uploadScoresAsync(self, ass, netids, scores):
+        """Upload scores to Canvas without waiting for Canvas to process them
+
+        Args:
+            ass (canvasapi.assignment.Assignment):
+                Assignment object
+            netids (ndarray of str):
+                Array of netids
+            scores (ndarray of floats):
+                Array of scores matching ordering of netids
+        Returns:
+            concurrent.futures.Future:
+                Completes when Canvas has finished processing the upload.  See
+                :py:meth:`cornellGrading.cornellGrading.waitAll`.
+
+        Notes:
+            Only netids matching those found in the currently loaded course will be
+            uplaoded.  Polling runs on a background thread pool, which is shut down
+            by waitAll, so always finish with a call to waitAll.
+        """
+
         # let's build up the submission dictionary
         # want API structure of grade_data[<student_id>][posted_grade]
         # this becomes grade_data = {'id (number)':{'posted_grade':'grade (number)',...}
@@ -719,26 +1418,90 @@ class cornellGrading:
         grade_data = {}
         for i, s in zip(netids, scores):
             if i == i:
-                if i in self.netids:
-                    grade_data["%d" % self.ids[self.netids == i]] = {
-                        "posted_grade": "%f" % s
-                    }
+                if i in self.netid2id:
+                    grade_data["%d" % self.netid2id[i]] = {"posted_grade": "%f" % s}
                 else:
                     unmatchedids.append(i)
 
         if unmatchedids:
             print("Could not match netids: %s" % ", ".join(unmatchedids))
 
-        # send payload
+        # nothing to send
+        if not grade_data:
+            print("No grades to upload.")
+            future = Future()
+            future.set_result(None)
+            return future
+
+        # send payload and poll for completion in the background
         print("Uploading Grades.")
         res = ass.submissions_bulk_update(grade_data=grade_data)
-        self.waitForSubmit(res)
-        print("Done.")
 
-    def waitForSubmit(self, res):
-        """Wait for async result object to finish"""
-        while res.query().workflow_state != "completed":
-            time.sleep(0.5)
+        if self.uploadExecutor is None:
+            self.uploadExecutor = ThreadPoolExecutor(max_workers=4)
+
+        return self.uploadExecutor.submit(self.waitForSubmit, res)
+
+    def waitAll(self, futures):
+        """Wait for multiple asynchronous uploads to finish
+
+        Args:
+            futures (list):
+                concurrent.futures.Future objects as returned by
+                :py:meth:`cornellGrading.cornellGrading.uploadScoresAsync`
+
+        Returns:
+            None
+
+        Notes:
+            Also shuts down the background polling thread pool, after waiting for
+            any other uploads still in progress.
+
+        """
+
+        try:
+            for f in futures:
+                f.result()
+        finally:
+            if self.uploadExecutor is not None:
+                self.uploadExecutor.shutdown()
+                self.uploadExecutor = None
+
+    def waitForSubmit(self, res, delay=0.05, maxDelay=1.0, timeout=300):
+        """Wait for async result object to finish
+
+        Args:
+            res (canvasapi.progress.Progress):
+                Progress object to poll
+            delay (float):
+                Initial time (in seconds) between polls. Defaults to 0.05.
+            maxDelay (float):
+                Polling interval doubles after each poll up to this value (in
+                seconds). Defaults to 1.0.  Each interval is randomly stretched by up
+                to 10% so that concurrent waits don't poll in lockstep.
+            timeout (float):
+                Maximum time (in seconds) to wait for completion. Defaults to 300.
+
+        Returns:
+            None
+
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            prog = res.query()
+            if prog.workflow_state == "completed":
+                break
+            if prog.workflow_state == "failed":
+                raise RuntimeError(
+                    f"Canvas job failed: {getattr(prog, 'message', None)}"
+                )
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Canvas job did not complete within {timeout} seconds."
+                )
+
+            time.sleep(delay * random.uniform(1.0, 1.1))
+            delay = min(delay * 2, maxDelay)
 
         return
 
@@ -788,21 +1551,16 @@ class cornellGrading:
 
         """
 
-        # check that this one doesn't already exist
-        res = self.qualtrics.getMailingLists()
-        assert self.coursename not in [
-            el["name"] for el in res.json()["result"]["elements"]
-        ], "Mailing list already exists for this course."
-
-        names = np.array([n.split(", ") for n in self.names])
-        emails = np.array([nid + "@cornell.edu" for nid in self.netids])
-        firstNames = names[:, 1]
-        lastNames = names[:, 0]
+        # check that this one doesn't already exist (this also stores the current
+        # lists, so later getMailingListId calls don't need to re-list)
+        listnames, _ = self.qualtrics.listMailingLists()
+        assert (
+            self.coursename not in listnames
+        ), "Mailing list already exists for this course."
 
         mailingListId = self.qualtrics.genMailingList(self.coursename)
 
-        for fN, lN, em in zip(firstNames, lastNames, emails):
-            self.qualtrics.addListContact(mailingListId, fN, lN, em)
+        self.qualtrics.addListContacts(mailingListId, self.contacts)
 
     def updateCourseMailingList(self):
         """Compares course qualtrics mailing list to current roster and updates
@@ -820,33 +1578,23 @@ class cornellGrading:
         mailingListId = self.qualtrics.getMailingListId(self.coursename)
         tmp = self.qualtrics.getListContacts(mailingListId)
 
-        listids = []
-        listemails = []
-        for el in tmp:
-            listids.append(el["id"])
-            listemails.append(el["email"])
+        email2listid = {el["email"]: el["id"] for el in tmp}
 
-        names = np.array([n.split(", ") for n in self.names])
-        emails = np.array([nid + "@cornell.edu" for nid in self.netids])
-        firstNames = names[:, 1]
-        lastNames = names[:, 0]
+        email2name = {email: (fN, lN) for fN, lN, email in self.contacts}
 
         # find missing
-        missing = list(set(emails) - set(listemails))
+        missing = email2name.keys() - email2listid.keys()
         if missing:
-            for m in missing:
-                ind = emails == m
-                self.qualtrics.addListContact(
-                    mailingListId, firstNames[ind][0], lastNames[ind][0], m
-                )
+            self.qualtrics.addListContacts(
+                mailingListId, [(*email2name[m], m) for m in missing]
+            )
 
         # find extraneous names
-        extra = list(set(listemails) - set(emails))
+        extra = email2listid.keys() - email2name.keys()
         if extra:
-            for e in extra:
-                self.qualtrics.deleteListContact(
-                    mailingListId, np.array(listids)[np.array(listemails) == e][0]
-                )
+            self.qualtrics.deleteListContacts(
+                mailingListId, [email2listid[e] for e in extra]
+            )
 
     def genHWSurvey(self, surveyname, nprobs):
         """Create a HW self-grade survey
@@ -910,40 +1658,45 @@ class cornellGrading:
             "QuestionText_Unsafe": "Enter your netid",
         }
 
-        self.qualtrics.addSurveyQuestion(surveyId, questionDef)
+        questionDefs = [questionDef]
 
         # add rubric questions for all problems
+        # only the text and ids change between problems, so start from a template
+        questionTemplate = {
+            "QuestionType": "MC",
+            "Selector": "SAVR",
+            "SubSelector": "TX",
+            "Configuration": {"QuestionDescriptionOption": "UseText"},
+            "Choices": {
+                "1": {"Display": "0"},
+                "2": {"Display": "1"},
+                "3": {"Display": "2"},
+                "4": {"Display": "3"},
+            },
+            "ChoiceOrder": [1, 2, 3, 4],
+            "Validation": {
+                "Settings": {
+                    "ForceResponse": "ON",
+                    "ForceResponseType": "ON",
+                    "Type": "None",
+                }
+            },
+            "Language": [],
+            "DataVisibility": {"Private": False, "Hidden": False},
+            "NextChoiceId": 5,
+            "NextAnswerId": 1,
+        }
         for j in range(1, nprobs + 1):
-            questionDef = {
-                "QuestionText": "Question %d Score" % j,
-                "DataExportTag": "Q%d" % (j + 1),
-                "QuestionType": "MC",
-                "Selector": "SAVR",
-                "SubSelector": "TX",
-                "Configuration": {"QuestionDescriptionOption": "UseText"},
-                "QuestionDescription": "Question %d Score" % j,
-                "Choices": {
-                    "1": {"Display": "0"},
-                    "2": {"Display": "1"},
-                    "3": {"Display": "2"},
-                    "4": {"Display": "3"},
-                },
-                "ChoiceOrder": [1, 2, 3, 4],
-                "Validation": {
-                    "Settings": {
-                        "ForceResponse": "ON",
-                        "ForceResponseType": "ON",
-                        "Type": "None",
-                    }
-                },
-                "Language": [],
-                "QuestionID": "QID%d" % (j + 1),
-                "DataVisibility": {"Private": False, "Hidden": False},
-                "NextChoiceId": 5,
-                "NextAnswerId": 1,
-                "QuestionText_Unsafe": "Question %d Score" % j,
-            }
-            self.qualtrics.addSurveyQuestion(surveyId, questionDef)
+            desc = "Question %d Score" % j
+            questionDef = questionTemplate.copy()
+            questionDef["QuestionText"] = desc
+            questionDef["QuestionDescription"] = desc
+            questionDef["QuestionText_Unsafe"] = desc
+            questionDef["DataExportTag"] = "Q%d" % (j + 1)
+            questionDef["QuestionID"] = "QID%d" % (j + 1)
+            questionDefs.append(questionDef)
+
+        self.qualtrics.addSurveyQuestions(surveyId, questionDefs)
 
         # publish and activate
         self.qualtrics.publishSurvey(surveyId)
@@ -986,12 +1739,13 @@ class cornellGrading:
         surveyname = "%s HW%d Self-Grade" % (self.coursename, assignmentNum)
         assname = "HW%d Self-Grading" % assignmentNum
 
-        link = self.genHWSurvey(surveyname, nprobs)
+        # Qualtrics survey generation and Canvas group lookup are independent
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            linkFuture = executor.submit(self.genHWSurvey, surveyname, nprobs)
 
-        try:
-            sg = self.getAssignmentGroup("Homework Self-Grading")
-        except AssertionError:
-            sg = self.createAssignmentGroup("Homework Self-Grading")
+            sg = self.getOrCreateAssignmentGroup("Homework Self-Grading")
+
+            link = linkFuture.result()
 
         desc = """<p>Solutions: </p>
                   <p>Grade yourself against the rubric in the syllabus and enter your
@@ -1081,13 +1835,7 @@ class cornellGrading:
 
         # ensure that assignment(s) don't already exist
         for h in hwnames:
-            try:
-                hw = self.getAssignment(h)
-                alreadyExists = True
-            except AssertionError:
-                alreadyExists = False
-
-            assert not (alreadyExists), "%s already exists" % h
+            assert self.findAssignment(h) is None, "%s already exists" % h
 
         # grab assignment group, homeworks folder and upload and set description
         if matlabParts > 0:
@@ -1105,11 +1853,10 @@ class cornellGrading:
             hwfoldername = "Homeworks/" + hwname
             hwfolder = self.createFolder(hwfoldername, hidden=True)
 
-            res = hwfolder.upload(hwfile)
-            assert res[0], "HW Upload failed."
+            res = self.uploadFile(hwfolder, hwfile)
 
-            hwurl = res[1]["url"]
-            hwfname = res[1]["filename"]
+            hwurl = res["url"]
+            hwfname = res["filename"]
             hwepoint = hwurl.split("/download")[0]
 
             desc = (
@@ -1189,6 +1936,10 @@ class cornellGrading:
             "for installation instructions."
         )
 
+        # the parser needs pdf2image (and PIL), which are optional and slow to import,
+        # so only load them when actually converting
+        from cornellGrading.pandocHTMLParser import pandocHTMLParser
+
         # going to assume that the pdf file is located in the working dir with the tex
         # and everything else that's needed for compilation
         hwd, hwf = os.path.split(fname)
@@ -1203,41 +1954,24 @@ class cornellGrading:
 
         # all new products are going into the system tmp dir
         tmpdir = tempfile.gettempdir()
-        htmlf = os.path.join(tmpdir, hwf.split(os.extsep)[0] + os.extsep + "html")
-
-        # preflight: let's replace tex commands that Canvas can't handle
-        texsubdict = {
-            r"\\nicefrac": r"\\frac",
-            r"\\ensuremath": r"",
-            r"\\leftmoon": r"\\mathrm{Moon}",
-            r"\\Venus": r"Venus",
-        }
 
-        # read orig tex
+        # read orig tex (in full, as the source may itself be in tmpdir)
         with open(os.path.join(hwd, texf)) as f:
             lines = f.readlines()
 
-        # parse orig tex, flattening any inputs
-        inputp = re.compile(r"\\input{([^}]+)}")
-        linesout = []
-        for ll in lines:
-            # if line contains and input, repace it with the input.
-            if inputp.search(ll):
-                tmp = inputp.search(ll)
-                with open(os.path.join(hwd, tmp.group(1))) as f:
-                    newlines = f.readlines()
-
-                ll = ll.replace(tmp.group(0), " ".join(newlines))
-
-            # apply substitutions
-            for key, val in texsubdict.items():
-                ll = re.sub(key, val, ll)
+        # parse orig tex, flattening any inputs, and write out as we go
+        with open(os.path.join(tmpdir, texf), "w") as fout:
+            for ll in lines:
+                # if line contains and input, repace it with the input.
+                tmp = self.texInputPattern.search(ll)
+                if tmp:
+                    with open(os.path.join(hwd, tmp.group(1))) as f:
+                        ll = ll.replace(tmp.group(0), " ".join(f))
 
-            linesout.append(ll)
+                # preflight: replace tex commands that Canvas can't handle
+                ll = self.texSubPattern.sub(lambda m: self.texSubs[m.group()], ll)
 
-        with open(os.path.join(tmpdir, texf), "w") as f:
-            for ll in linesout:
-                f.write(ll)
+                fout.write(ll)
 
         # run pandoc
         if not (hwd):
@@ -1248,8 +1982,6 @@ class cornellGrading:
             os.path.join(tmpdir, texf),
             "-s",
             "--webtex",
-            "-o",
-            htmlf,
             "--default-image-extension=png",
         ]
 
@@ -1259,62 +1991,64 @@ class cornellGrading:
         else:
             have_crossref = False
 
-        _ = subprocess.run(
+        # html is written to stdout, so it can be parsed without a round trip to disk
+        res = subprocess.run(
             pandoc_comm,
             cwd=hwd,
             check=True,
             capture_output=True,
+            encoding="utf-8",
         )
 
-        assert os.path.exists(htmlf), "Cannot locate html output %s" % htmlf
-
-        # read result
-        with open(htmlf) as f:
-            lines = f.readlines()
-
         upfolder = self.createFolder(folder, hidden=hidden)
 
         # latex conversion
-        p = re.compile(r'src="https://latex.codecogs.com/png.latex\?(.*?)"')
-
         def convlatex(x):
-            return re.sub(x.groups()[0], urllib.parse.quote(x.groups()[0]), x.group())
+            return x.group().replace(x.group(1), urllib.parse.quote(x.group(1)))
+
+        # now we need to parse the result and fix things. Figures are converted and
+        # uploaded in the background while parsing continues
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parser = pandocHTMLParser(hwd, upfolder, executor=executor)
+            out = []
+            nspans = 0
+            for line in io.StringIO(res.stdout):
+                parser.feed(line)
+                if not parser.inBody:
+                    continue
 
-        # now we need to parse the result and fix things
-        parser = pandocHTMLParser(hwd, upfolder)
-        out = []
-        for line in lines:
-            parser.feed(line)
-            if parser.inBody:
-                tmp = p.sub(convlatex, line)
+                tmp = self.webtexPattern.sub(convlatex, line)
 
                 if (len(parser.figcaptions) > 0) and not (have_crossref):
                     figcap = parser.figcaptions.pop()
-                    tmp = re.sub(r'alt=""', r'alt="{0}"'.format(figcap), tmp)
+                    tmp = tmp.replace('alt=""', 'alt="{0}"'.format(figcap))
 
                 if parser.spanDefs:
-                    for cl, val in parser.spanDefs.items():
-                        tmp = re.sub(cl, 'style="{}"'.format(val), tmp)
+                    # span definitions are all in the header style block, so this is
+                    # only rebuilt if new ones turn up
+                    if len(parser.spanDefs) != nspans:
+                        nspans = len(parser.spanDefs)
+                        spanDefs = list(parser.spanDefs.items())
+                        spanPattern = re.compile(
+                            "|".join("({})".format(re.escape(cl)) for cl, _ in spanDefs)
+                        )
+                    tmp = spanPattern.sub(
+                        lambda m: 'style="{}"'.format(spanDefs[m.lastindex - 1][1]), tmp
+                    )
 
                 if parser.inNestedOL:
-                    tmp = re.sub(r"<ol>", r'<ol type="a">', tmp)
+                    tmp = tmp.replace("<ol>", '<ol type="a">')
 
                 out.append(tmp)
 
+            parser.waitForImages()
+
         # put everything together into a isngle string
         out = out[1:]
         out = " ".join(out)
 
         # global replacements
-        repdict = {
-            r'class="math display"': r'style="display: block; text-align: center; margin: 0.5rem auto;"',
-            r'img[\s]*style="vertical-align:middle"': r'img class="equation_image"',
-            r'src="https://latex.codecogs.com/png.latex\?': r'src="https://canvas.cornell.edu/equation_images/',
-            r"<figcaption": '<figcaption style="text-align: center;"',
-        }
-
-        for k, v in repdict.items():
-            out = re.sub(k, v, out)
+        out = self.htmlSubPattern.sub(lambda m: self.htmlSubs[m.lastindex - 1][1], out)
 
         # handle all uploaded figures:
         while parser.imagesUploaded:
@@ -1327,8 +2061,6 @@ class cornellGrading:
             out = re.sub(r'src="{0}"'.format(imup["orig"]), canvasimurl, out)
 
         # figures less than 100% width get centered:
-        p2 = re.compile(r'style="([\S]*)?(?=")"')
-
         def convwidth(x):
             return re.sub(
                 x.group(1),
@@ -1336,7 +2068,7 @@ class cornellGrading:
                 x.group(),
             )
 
-        out = p2.sub(convwidth, out)
+        out = self.stylePattern.sub(convwidth, out)
 
         # handle any labeled equations
         if parser.eqlabels:
@@ -1412,32 +2144,36 @@ class cornellGrading:
             choices[str(j + 1)] = {"Display": str(choice)}
         choiceOrder = list(range(1, len(choices) + 1))
 
+        # only the text and ids change between questions, so start from a template
+        questionTemplate = {
+            "QuestionType": "MC",
+            "Selector": "SAVR",
+            "SubSelector": "TX",
+            "Configuration": {"QuestionDescriptionOption": "UseText"},
+            "Choices": choices,
+            "ChoiceOrder": choiceOrder,
+            "Validation": {
+                "Settings": {
+                    "ForceResponse": "ON",
+                    "ForceResponseType": "ON",
+                    "Type": "None",
+                }
+            },
+            "Language": [],
+            "DataVisibility": {"Private": False, "Hidden": False},
+            "NextChoiceId": 5,
+            "NextAnswerId": 1,
+        }
+
+        questionDefs = []
         if nprobs == 0:
-            questionDef = {
-                "QuestionText": "HW Score",
-                "DataExportTag": "Q1",
-                "QuestionType": "MC",
-                "Selector": "SAVR",
-                "SubSelector": "TX",
-                "Configuration": {"QuestionDescriptionOption": "UseText"},
-                "QuestionDescription": "HW Score",
-                "Choices": choices,
-                "ChoiceOrder": choiceOrder,
-                "Validation": {
-                    "Settings": {
-                        "ForceResponse": "ON",
-                        "ForceResponseType": "ON",
-                        "Type": "None",
-                    }
-                },
-                "Language": [],
-                "QuestionID": "QID1",
-                "DataVisibility": {"Private": False, "Hidden": False},
-                "NextChoiceId": 5,
-                "NextAnswerId": 1,
-                "QuestionText_Unsafe": "HW Score",
-            }
-            self.qualtrics.addSurveyQuestion(surveyId, questionDef)
+            questionDef = questionTemplate.copy()
+            questionDef["QuestionText"] = "HW Score"
+            questionDef["QuestionDescription"] = "HW Score"
+            questionDef["QuestionText_Unsafe"] = "HW Score"
+            questionDef["DataExportTag"] = "Q1"
+            questionDef["QuestionID"] = "QID1"
+            questionDefs.append(questionDef)
 
         # add rubric questions for all problems
         for j in range(1, nprobs + 1):
@@ -1446,31 +2182,15 @@ class cornellGrading:
             else:
                 desc = "Question %d Score" % j
 
-            questionDef = {
-                "QuestionText": desc,
-                "DataExportTag": "Q%d" % (j + 1),
-                "QuestionType": "MC",
-                "Selector": "SAVR",
-                "SubSelector": "TX",
-                "Configuration": {"QuestionDescriptionOption": "UseText"},
-                "QuestionDescription": desc,
-                "Choices": choices,
-                "ChoiceOrder": choiceOrder,
-                "Validation": {
-                    "Settings": {
-                        "ForceResponse": "ON",
-                        "ForceResponseType": "ON",
-                        "Type": "None",
-                    }
-                },
-                "Language": [],
-                "QuestionID": "QID%d" % (j + 1),
-                "DataVisibility": {"Private": False, "Hidden": False},
-                "NextChoiceId": 5,
-                "NextAnswerId": 1,
-                "QuestionText_Unsafe": desc,
-            }
-            self.qualtrics.addSurveyQuestion(surveyId, questionDef)
+            questionDef = questionTemplate.copy()
+            questionDef["QuestionText"] = desc
+            questionDef["QuestionDescription"] = desc
+            questionDef["QuestionText_Unsafe"] = desc
+            questionDef["DataExportTag"] = "Q%d" % (j + 1)
+            questionDef["QuestionID"] = "QID%d" % (j + 1)
+            questionDefs.append(questionDef)
+
+        self.qualtrics.addSurveyQuestions(surveyId, questionDefs)
 
         # publish and activate
         self.qualtrics.publishSurvey(surveyId)
@@ -1493,6 +2213,7 @@ class cornellGrading:
         injectText=False,
         selfGradeDueDelta=7,
         selfGradeReleasedDelta=3,
+        maxWorkers=8,
     ):
         """Create qualtrics self-grading survey, individualized links distribution,
         a Canvas post for where the solutions will go, and injects links into assignment
@@ -1525,6 +2246,8 @@ class cornellGrading:
             selfGradeReleasedDelta (float):
                 Days after initial hw duedate that self-grading (and solutions) are
                 released.
+            maxWorkers (int):
+                Maximum number of simultaneous submission comment posts (default 8)
 
 
         Returns:
@@ -1544,53 +2267,61 @@ class cornellGrading:
         mailingListId = self.qualtrics.getMailingListId(self.coursename)
         dist = self.qualtrics.genDistribution(surveyId, mailingListId)
 
-        distnetids = np.array([d["email"].split("@")[0] for d in dist])
+        netid2link = {d["email"].split("@")[0]: d["link"] for d in dist}
 
         # grab the original assignment and all the submissions
         hwname = "Written HW%d" % assignmentNum
         hw = self.getAssignment(hwname)
-        subs = hw.get_submissions()
+        subs = hw.get_submissions(per_page=100)
 
         # inject links to all users in distribution
         missing = []
-        for s in subs:
-            if self.netids[self.ids == s.user_id][0] in distnetids:
-                link = dist[
-                    np.where(distnetids == self.netids[self.ids == s.user_id])[0][0]
-                ]["link"]
-                _ = s.edit(
-                    comment={
-                        "text_comment": "One-time link to self-grading survey:\n %s"
-                        % link
-                    }
-                )
-            else:
-                missing.append(self.netids[self.ids == s.user_id][0])
+        posts = {}
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            for s in subs:
+                netid = self.id2netid[s.user_id]
+                if netid in netid2link:
+                    posts[netid] = executor.submit(
+                        s.edit,
+                        comment={
+                            "text_comment": "One-time link to self-grading survey:\n %s"
+                            % netid2link[netid]
+                        },
+                    )
+                else:
+                    missing.append(netid)
+
+        failed = []
+        for netid, f in posts.items():
+            try:
+                _ = f.result()
+            except CanvasException:
+                failed.append(netid)
 
         if missing:
             print("Could not identify links for the following users:")
             print("\n".join(missing))
 
+        if failed:
+            print("Could not post links for the following users:")
+            print("\n".join(failed))
+
         if createAss:
-            duedate = datetime.strptime(hw.due_at, """%Y-%m-%dT%H:%M:%S%z""")
+            duedate = hw.due_at_date
             assname = "HW%d Self-Grading" % assignmentNum
 
             # grab self-grading group
-            try:
-                sg = self.getAssignmentGroup("Homework Self-Grading")
-            except AssertionError:
-                sg = self.createAssignmentGroup("Homework Self-Grading")
+            sg = self.getOrCreateAssignmentGroup("Homework Self-Grading")
 
             # grab homeworks folder
             hwfoldername = "Homeworks/HW%d" % assignmentNum
             hwfolder = self.createFolder(hwfoldername, hidden=True)
 
             # upload
-            res = hwfolder.upload(solutions)
-            assert res[0], "Solutions Upload failed."
+            res = self.uploadFile(hwfolder, solutions)
 
-            solurl = res[1]["url"]
-            solfname = res[1]["filename"]
+            solurl = res["url"]
+            solfname = res["filename"]
             solepoint = solurl.split("/download")[0]
 
             desc = (
@@ -1617,6 +2348,67 @@ class cornellGrading:
                 unlock_at=duedate + timedelta(days=selfGradeReleasedDelta),
             )
 
+    def exportSurveyCSV(self, surveyId, surveyname, saveDir=None, useCache=False):
+        """Export Qualtrics survey results to csv, reusing an earlier export if possible
+
+        Args:
+            surveyId (str):
+                Unique id string of survey
+            surveyname (str):
+                Name of survey
+            saveDir (str):
+                Save path for raw survey output.  Defaults to None (in which case it
+                goes to the system tmp dir)
+            useCache (bool):
+                Reuse a cached export if available, and cache new exports (defaults
+                False)
+
+        Returns:
+            str:
+                Full path to csv file
+
+        Notes:
+            Exports are cached in the cache directory (see
+            :py:meth:`cornellGrading.cornellGrading.cacheFile`), keyed by survey id
+            and the survey's response counts, so that a new export is only requested
+            when responses have been added or deleted.  Edits to existing responses
+            do not change the counts, so a cached export may be stale if responses
+            have been corrected in Qualtrics.  Only use the cache when re-running an
+            import on a survey whose responses are known to be unchanged.
+
+        """
+
+        if saveDir is None:
+            saveDir = os.path.join(tempfile.gettempdir(), surveyId)
+        surveyfile = os.path.join(saveDir, surveyname.replace(":", "_") + ".csv")
+
+        if useCache:
+            counts = self.qualtrics.getSurveyResponseCounts(surveyId)
+            cacheprefix = "survey_{}_".format(surveyId)
+            cachefile = self.cacheFile(
+                "{}{auditable}_{deleted}.csv".format(cacheprefix, **counts)
+            )
+            if os.path.isfile(cachefile):
+                os.makedirs(saveDir, exist_ok=True)
+                shutil.copyfile(cachefile, surveyfile)
+                return surveyfile
+
+        _ = self.qualtrics.exportSurvey(surveyId, saveDir=saveDir)
+        assert os.path.isfile(surveyfile), "Survey results not where expected."
+
+        if useCache:
+            # replace any older exports of this survey
+            cachedir = os.path.dirname(cachefile)
+            os.makedirs(cachedir, exist_ok=True)
+            for f in os.listdir(cachedir):
+                if f.startswith(cacheprefix):
+                    os.remove(os.path.join(cachedir, f))
+            tmpfile = f"{cachefile}.{os.getpid()}.{threading.get_ident()}"
+            shutil.copyfile(surveyfile, tmpfile)
+            os.replace(tmpfile, cachefile)
+
+        return surveyfile
+
     def selfGradingImport(
         self,
         assignmentNum,
@@ -1626,6 +2418,7 @@ class cornellGrading:
         maxDaysLate=3,
         noUpload=False,
         saveDir=None,
+        useCache=False,
     ):
         """Qualtrics self-grading survey import.
 
@@ -1648,6 +2441,10 @@ class cornellGrading:
             saveDir (str):
                 Save path for raw survey output.  Defaults to None (in which case it
                 goes to the system tmp dir)
+            useCache (bool):
+                Reuse an earlier survey export if no responses have been added or
+                deleted since (defaults False).  See
+                :py:meth:`cornellGrading.cornellGrading.exportSurveyCSV`
         Returns:
             tuple:
                 netids (str array):
@@ -1664,113 +2461,113 @@ class cornellGrading:
 
         """
 
-        # grab the canvas column
+        import pandas
+
         hwname = "HW%d" % assignmentNum
         hw = self.getAssignment(hwname)
-        duedate = datetime.strptime(hw.due_at, """%Y-%m-%dT%H:%M:%S%z""")
+        duedate = hw.due_at_date
         totscore = hw.points_possible
 
-        # grab the survey
+        # start the survey export in the background, and grab the canvas submissions
+        # while it runs
         surveyname = "%s HW%d Self-Grade" % (self.coursename, assignmentNum)
-        surveyId = self.qualtrics.getSurveyId(surveyname)
-        tmpdir = self.qualtrics.exportSurvey(surveyId, saveDir=saveDir)
-
-        if ":" in surveyname:
-            surveyname = surveyname.replace(":", "_")
-        surveyfile = os.path.join(tmpdir, surveyname + ".csv")
-        assert os.path.isfile(surveyfile), "Survey results not where expected."
-
-        qualtrics = pandas.read_csv(surveyfile, header=[0, 1, 2])
-        # find netid and question cols in Qualtrics
-        qnetidcol = qualtrics.columns.get_level_values(0)[
-            np.array(
-                ["Enter your netid" in c for c in qualtrics.columns.get_level_values(1)]
+        executor = ThreadPoolExecutor(max_workers=1)
+        exportFuture = executor.submit(
+            lambda: self.exportSurveyCSV(
+                self.qualtrics.getSurveyId(surveyname),
+                surveyname,
+                saveDir=saveDir,
+                useCache=useCache,
             )
-        ]
+        )
+        try:
+            if checkLate:
+                # submission info in roster order (has submission record, submission
+                # time string, late flag)
+                id2ind = {i: j for j, i in enumerate(self.ids.tolist())}
+                hassub = np.zeros(len(self.ids), dtype=bool)
+                submitted = np.full(len(self.ids), None, dtype=object)
+                lates = np.zeros(len(self.ids), dtype=bool)
+                for t in hw.get_submissions(per_page=100):
+                    j = id2ind.get(t.user_id)
+                    if j is not None:
+                        hassub[j] = True
+                        submitted[j] = t.submitted_at or None
+                        lates[j] = t.late
+
+            surveyfile = exportFuture.result()
+        except BaseException:
+            # don't sit waiting on the export if the canvas side failed
+            exportFuture.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=False)
+
+        # only parse the netid/email and score columns
+        qualtrics = readSurveyCSV(surveyfile, "Enter your netid|Score")
+        # find netid and question cols in Qualtrics
+        questext = qualtrics.columns.get_level_values(1).astype(str)
+        qnetidcol = np.asarray(questext.str.contains("Enter your netid", regex=False))
 
         # if not netid col, assume that this is a private survey and grab the email col
-        if qnetidcol.empty:
-            qnetids = np.array(
-                [e[0].split("@")[0] for e in qualtrics["RecipientEmail"].values]
+        if not np.any(qnetidcol):
+            qnetids = (
+                qualtrics["RecipientEmail"]
+                .iloc[:, 0]
+                .str.split("@", n=1)
+                .str[0]
+                .to_numpy()
             )
         else:
-            qnetids = np.array([n[0].lower() for n in qualtrics[qnetidcol].values])
+            qnetids = qualtrics.iloc[:, qnetidcol].iloc[:, 0].str.lower().to_numpy()
 
         # calculate total scores
-        quescolinds = np.array(
-            [
-                "Question" in c and "Score" in c
-                for c in qualtrics.columns.get_level_values(1)
-            ]
+        quescolinds = np.asarray(
+            questext.str.contains("Question", regex=False)
+            & questext.str.contains("Score", regex=False)
         )
         if np.any(quescolinds):
-            quescols = qualtrics.columns.get_level_values(0)[quescolinds]
-            quesnames = qualtrics.columns.get_level_values(1)[quescolinds]
-            isec = np.array(["Extra Credit" in c for c in quesnames])
-
-            scores = (
-                qualtrics[quescols[~isec]].values.sum(axis=1)
-                / 3.0
-                / len(quescols[~isec])
-                * totscore
-            )
+            isec = np.asarray(questext.str.contains("Extra Credit", regex=False))
+            isec = isec[quescolinds]
+
+            # weight each question so that regular questions sum to totscore and
+            # extra credit questions to ecscore, and sum everything in one pass
+            weights = np.zeros(len(isec))
+            weights[~isec] = totscore / 3.0 / np.sum(~isec)
             if np.any(isec):
-                scores += (
-                    qualtrics[quescols[isec]].values.sum(axis=1)
-                    / 3.0
-                    / len(quescols[isec])
-                    * ecscore
-                )
+                weights[isec] = ecscore / 3.0 / np.sum(isec)
+            scores = qualtrics.iloc[:, quescolinds].values @ weights
         else:
-            totscorecol = qualtrics.columns.get_level_values(0)[
-                np.array(
-                    ["HW Score" in c for c in qualtrics.columns.get_level_values(1)]
-                )
-            ]
-            assert not (totscorecol.empty), "Cannot locate any scores."
-            scores = np.array(qualtrics[totscorecol].values).astype(float)
+            totscorecol = np.asarray(questext.str.contains("HW Score", regex=False))
+            assert np.any(totscorecol), "Cannot locate any scores."
+            scores = qualtrics.iloc[:, totscorecol].values[:, 0].astype(float)
 
         if checkLate:
-            # get submission times
-            tmp = hw.get_submissions()
-            subnetids = []
-            subtimes = []
-            lates = []
-            for t in tmp:
-                if t.user_id in self.ids:
-                    subnetids.append(self.netids[self.ids == t.user_id][0])
-                    if t.submitted_at:
-                        subtime = datetime.strptime(
-                            t.submitted_at, """%Y-%m-%dT%H:%M:%S%z"""
-                        )
-                        tdelta = duedate - subtime
-                        subtimes.append(tdelta.total_seconds())
-                    else:
-                        subtimes.append(np.nan)
-                    lates.append(t.late)
-
-            subnetids = np.array(subnetids)
-            subtimes = np.array(subtimes)
-            lates = np.array(lates)
-
-            # update scores based on lateness
-            for j, i in enumerate(qnetids):
-                if (i == i) and (i in self.netids):
-                    if np.isnan(subtimes[subnetids == i][0]):
-                        scores[j] = 0
-                    else:
-                        # if late take away 25% of the totscore
-                        if (subtimes[subnetids == i][0] < -5 * 60.0) and lates[
-                            subnetids == i
-                        ][0]:
-                            scores[j] -= totscore * latePenalty
-                        # if more than maxDaysLate, you get NOTHING! good day, sir!
-                        if (
-                            subtimes[subnetids == i][0]
-                            < -5 * 60.0 - maxDaysLate * 86400.0
-                        ):
-                            scores[j] = 0
-            scores[scores < 0] = 0
+            # align survey responses with roster submission records
+            netid2ind = {n: j for j, n in enumerate(self.netids.tolist())}
+            qinds = np.array([netid2ind.get(i, -1) for i in qnetids], dtype=int)
+            matched = qinds >= 0
+            matched[matched] = hassub[qinds[matched]]
+
+        # only responses with a matching submission record need checking
+        if checkLate and np.any(matched):
+            # seconds before due date (NaN for no submission)
+            submitted = pandas.to_datetime(
+                submitted[qinds[matched]], utc=True, format="%Y-%m-%dT%H:%M:%S%z"
+            )
+            qsubtimes = np.full(len(qnetids), np.nan)
+            qsubtimes[matched] = (pandas.Timestamp(duedate) - submitted).total_seconds()
+            qlates = np.zeros(len(qnetids), dtype=bool)
+            qlates[matched] = lates[qinds[matched]]
+
+            # update scores based on lateness:
+            # no submission gets nothing, late takes away latePenalty of the totscore,
+            # and if more than maxDaysLate, you get NOTHING! good day, sir!
+            nosub = matched & np.isnan(qsubtimes)
+            late = (qsubtimes < -5 * 60.0) & qlates
+            verylate = qsubtimes < -5 * 60.0 - maxDaysLate * 86400.0
+            scores = np.where(late, scores - totscore * latePenalty, scores)
+            scores = np.where(nosub | verylate, 0.0, scores).clip(min=0)
 
         if not (noUpload):
             self.uploadScores(hw, qnetids, scores)
@@ -1794,15 +2591,17 @@ class cornellGrading:
 
         """
 
+        import pandas
+
         if outfile is None:
             outfile = "{} Groups.csv".format(self.coursename)
 
-        grps = self.course.get_groups()
+        grps = self.course.get_groups(per_page=100)
 
         grpname = []
         grpmember = []
         for grp in grps:
-            usrs = grp.get_users()
+            usrs = grp.get_users(per_page=100)
             for usr in usrs:
                 grpname.append(grp.name)
                 grpmember.append(usr.login_id + "@cornell.edu")
@@ -1901,7 +2700,7 @@ class cornellGrading:
 
         """
 
-        mdls = self.course.get_modules()
+        mdls = self.course.get_modules(per_page=100)
 
         modules = []
         for md in mdls:
@@ -1923,7 +2722,7 @@ class cornellGrading:
 
         """
 
-        tmp = self.course.get_modules()
+        tmp = self.course.get_modules(per_page=100)
         md = None
         for t in tmp:
             if t.name == moduleName:
@@ -1978,14 +2777,14 @@ class cornellGrading:
                     # module may have been updated, so let's find the true largest
                     # position
                     maxpos = 0
-                    for mi in module.get_module_items():
+                    for mi in module.get_module_items(per_page=100):
                         if mi.position > maxpos:
                             maxpos = mi.position
 
                     position = maxpos + 1
                 else:
                     minpos = 999999
-                    for mi in module.get_module_items():
+                    for mi in module.get_module_items(per_page=100):
                         if mi.position < minpos:
                             minpos = mi.position
 
@@ -2019,7 +2818,10 @@ class cornellGrading:
             "Authorization": "Bearer {}".format(self.course._requester.access_token)
         }
 
-        r = requests.post(full_url, json={"item": item}, headers=headers)
+        # reuse canvasapi's session so that connections are kept alive between items
+        r = self.course._requester._session.post(
+            full_url, json={"item": item}, headers=headers
+        )
         assert r.status_code == 200
 
     def genHomeworkName(self, assignmentNum, preamble=""):
@@ -2124,7 +2926,7 @@ class cornellGrading:
         hwname, hw = self.getHomework(assignmentNum, preamble=preamble)
 
         # figure out all dates
-        duedate = datetime.strptime(hw.due_at, """%Y-%m-%dT%H:%M:%S%z""")
+        duedate = hw.due_at_date
         unlockdate = duedate + timedelta(days=selfGradeReleasedDelta)
         selfgradeduedate = unlockdate + timedelta(days=selfGradeDueDelta)
 
@@ -2203,17 +3005,15 @@ class cornellGrading:
         """
 
         totscore = hw.points_possible
-        duedate = datetime.strptime(hw.due_at, """%Y-%m-%dT%H:%M:%S%z""")
+        duedate = hw.due_at_date
 
         lates = {}
-        for t in hw.get_submissions():
-            if t.user_id in self.ids:
-                netid = self.netids[self.ids == t.user_id][0]
+        for t in hw.get_submissions(per_page=100):
+            if t.user_id in self.id2netid:
+                netid = self.id2netid[t.user_id]
 
                 if t.submitted_at:
-                    subtime = datetime.strptime(
-                        t.submitted_at, """%Y-%m-%dT%H:%M:%S%z"""
-                    )
+                    subtime = t.submitted_at_date
                     if not t.late:
                         tdelta = 0
                     else:
@@ -2274,12 +3074,12 @@ class cornellGrading:
         netids = []
         scores = []
         submittedScoreNoAssignment = []
-        for sub in sg.get_submissions():
-            if sub.user_id not in self.ids:
+        for sub in sg.get_submissions(per_page=100):
+            if sub.user_id not in self.id2netid:
                 continue
             if sub.grade is None:
                 continue
-            netid = self.netids[self.ids == sub.user_id][0]
+            netid = self.id2netid[sub.user_id]
             if netid not in lates:
                 print(f"{netid} submitted self-grading but not the assignment!")
                 submittedScoreNoAssignment.append(netid)
@@ -2566,6 +3366,8 @@ class cornellGrading:
 
         """
 
+        import pandas
+
         assert isinstance(
             quiz, (canvasapi.new_quiz.NewQuiz, canvasapi.quiz.Quiz)
         ), "quiz input must be a Quiz or New Quiz object."
@@ -1,13 +1,56 @@
 import getpass
 import keyring
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import zipfile
 import tempfile
-import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import numpy as np
-import pandas
+
+
+class rateLimitRetry(Retry):
+    """urllib3 Retry that also retries non-idempotent requests on a 429 response
+
+    For use with any API that answers rate-limited requests with status 429
+    without processing them (e.g., Qualtrics), so these can be safely retried
+    regardless of method. Server errors are only retried for idempotent methods,
+    as a failed POST may still have taken effect. APIs that throttle with a
+    different status (e.g., Canvas, which uses 403) get no rate limit retries.
+
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        """Decide whether a response should be retried
+
+        Args:
+            method (str):
+                HTTP method of the request
+            status_code (int):
+                HTTP status code of the response
+            has_retry_after (bool):
+                Whether the response included a Retry-After header
+
+        Returns:
+            bool:
+                True if the request should be retried
+
+        Notes:
+            A 429 is taken to mean that the request was rejected before anything
+            was done, so it is retried for any method (while retries remain).
+            Other statuses in status_forcelist (i.e., 5xx) are left to the base
+            class, which only retries idempotent methods, as the server may have
+            partially processed a POST before failing.
+
+        """
+
+        if status_code == 429 and self.total:
+            return True
+
+        return super().is_retry(method, status_code, has_retry_after=has_retry_after)
 
 
 class cornellQualtrics:
@@ -21,6 +64,50 @@ class cornellQualtrics:
 
     """
 
+    # tokens retrieved during this session, keyed by data center, so that repeated
+    # instantiations don't go back to the system keychain
+    tokenCache = {}
+
+    # permissions granted to collaborators by shareSurvey
+    sharePermissions = {
+        "surveyDefinitionManipulation": {
+            "copySurveyQuestions": False,
+            "editSurveyFlow": False,
+            "useBlocks": False,
+            "useSkipLogic": False,
+            "useConjoint": False,
+            "useTriggers": False,
+            "useQuotas": False,
+            "setSurveyOptions": False,
+            "editQuestions": False,
+            "deleteSurveyQuestions": False,
+            "useTableOfContents": False,
+            "useAdvancedQuotas": False,
+        },
+        "surveyManagement": {
+            "editSurveys": False,
+            "activateSurveys": False,
+            "deactivateSurveys": False,
+            "copySurveys": False,
+            "distributeSurveys": False,
+            "deleteSurveys": False,
+            "translateSurveys": False,
+        },
+        "response": {
+            "editSurveyResponses": False,
+            "createResponseSets": False,
+            "viewResponseId": True,
+            "useCrossTabs": True,
+            "useScreenouts": True,
+        },
+        "result": {
+            "downloadSurveyResults": True,
+            "viewSurveyResults": True,
+            "filterSurveyResults": True,
+            "viewPersonalData": True,
+        },
+    }
+
     def __init__(
         self,
         dataCenter="cornell.ca1",
@@ -56,8 +143,31 @@ class cornellQualtrics:
 
         self.dataCenter = dataCenter
         self.qualtricsapi = qualtricsapi
+        self.apiUrl = f"https://{dataCenter}{qualtricsapi}"
+
+        # reuse connections across all API calls. The pool is sized for the
+        # concurrent helpers (addSurveyQuestions, addListContacts, etc.).  All
+        # requests are retried (with backoff) when rate limited, and idempotent ones
+        # are also retried on server errors
+        self.session = requests.Session()
+        retries = rateLimitRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries),
+        )
+
+        # mailing list ids keyed by name, and the personal library id
+        self.mailingListIds = {}
+        self.personalLibraryId = None
 
-        apiToken = keyring.get_password("qualtrics_token", "cornell.ca1")
+        apiToken = cornellQualtrics.tokenCache.get(dataCenter)
+        if apiToken is None:
+            apiToken = keyring.get_password("qualtrics_token", "cornell.ca1")
         if apiToken is None:
             if qualtrics_token_file is None:
                 apiToken = getpass.getpass("Enter qualtrics token:\n")
@@ -69,16 +179,18 @@ class cornellQualtrics:
             self.apiToken = apiToken
             self.setupHeaders()
 
-            self.listSurveys()
+            self.prefetch()
             keyring.set_password("qualtrics_token", "cornell.ca1", apiToken)
             print("Connected to Qualtrics. Token Saved")
         else:
             self.apiToken = apiToken
             self.setupHeaders()
 
-            self.listSurveys()
+            self.prefetch()
             print("Connected to Qualtrics.")
 
+        cornellQualtrics.tokenCache[dataCenter] = apiToken
+
     def setupHeaders(self):
         """Generate standard headers
 
@@ -104,6 +216,42 @@ class cornellQualtrics:
             "x-api-token": self.apiToken,
         }
 
+    def prefetch(self):
+        """Concurrently grab and store surveys, mailing lists and personal library id
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Notes:
+            Listing surveys also serves to verify the API token, so any error from
+            that request is raised.
+
+        """
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            surveys = executor.submit(self.listSurveys)
+            lists = executor.submit(self.listMailingLists)
+            libId = executor.submit(self.getPersonalLibraryId)
+
+            surveys.result()
+
+            # the remaining lookups are only a warm start: anything that fails here
+            # (bad status, malformed or non-JSON response, or connection error) will
+            # be retried (and any errors reported) when it is first used
+            for f in [lists, libId]:
+                try:
+                    f.result()
+                except (
+                    AssertionError,
+                    KeyError,
+                    ValueError,
+                    requests.RequestException,
+                ):
+                    pass
+
     def listSurveys(self, baseUrl=None):
         """Grab and store all available Qualtrics surveys
 
@@ -118,10 +266,10 @@ class cornellQualtrics:
         """
 
         if baseUrl is None:
-            baseUrl = "https://{0}{1}surveys".format(self.dataCenter, self.qualtricsapi)
+            baseUrl = f"{self.apiUrl}surveys"
 
         # get surveys
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
 
         assert response.status_code == 200, "Connection error."
 
@@ -140,6 +288,12 @@ class cornellQualtrics:
         self.surveyNames = np.array(surveynames)
         self.surveyIds = np.array(surveyids)
 
+        # survey ids keyed by name. If names repeat, the first survey listed is used
+        surveyname2id = {}
+        for n, i in zip(surveynames, surveyids):
+            surveyname2id.setdefault(n, i)
+        self.surveyname2id = surveyname2id
+
         return surveynames, surveyids
 
     def getSurveyNames(self, renew=False):
@@ -177,9 +331,9 @@ class cornellQualtrics:
         if renew:
             self.listSurveys()
 
-        assert surveyname in self.surveyNames, "Couldn't find this survey."
+        assert surveyname in self.surveyname2id, "Couldn't find this survey."
 
-        return self.surveyIds[self.surveyNames == surveyname][0]
+        return self.surveyname2id[surveyname]
 
     def getSurveyQuestions(self, surveyId):
         """Grab all available survey questions
@@ -194,10 +348,8 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}survey-definitions/{2}/questions".format(
-            self.dataCenter, self.qualtricsapi, surveyId
-        )
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/questions"
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
 
         return response
 
@@ -213,20 +365,48 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}mailinglists".format(
-            self.dataCenter,
-            self.qualtricsapi,
-        )
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        baseUrl = f"{self.apiUrl}mailinglists"
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
 
         return response
 
-    def getMailingListId(self, listName):
+    def listMailingLists(self):
+        """Grab and store all available Qualtrics mailing lists
+
+        Args:
+            None
+
+        Returns:
+            tuple:
+                listnames (list)
+                listids (list)
+
+        """
+
+        res = self.getMailingLists()
+
+        listnames = []
+        listids = []
+        for el in res.json()["result"]["elements"]:
+            listnames.append(el["name"])
+            listids.append(el["id"])
+
+        mailingListIds = {}
+        for n, i in zip(listnames, listids):
+            mailingListIds.setdefault(n, i)
+        self.mailingListIds = mailingListIds
+
+        return listnames, listids
+
+    def getMailingListId(self, listName, renew=False):
         """Find qualtrics mailinglist id by name.  Matching is exact.
 
         Args:
             listName (str):
                 Exact text of list name
+            renew (bool):
+                Renew stored list of mailing lists (default False). The stored list
+                is always renewed if listName is not found in it.
 
         Returns:
             str:
@@ -234,15 +414,37 @@ class cornellQualtrics:
 
         """
 
-        res = self.getMailingLists()
-        mailinglistid = None
-        for el in res.json()["result"]["elements"]:
-            if el["name"] == listName:
-                mailinglistid = el["id"]
-                break
-        assert mailinglistid, "Couldn't find this mailing list."
+        if renew or listName not in self.mailingListIds:
+            self.listMailingLists()
+
+        assert listName in self.mailingListIds, "Couldn't find this mailing list."
+
+        return self.mailingListIds[listName]
+
+    def getPersonalLibraryId(self, renew=False):
+        """Find the id of the user's personal library
+
+        Args:
+            renew (bool):
+                Look the library id up again even if it is already known
+                (default False)
 
-        return mailinglistid
+        Returns:
+            str:
+                Unique library id
+
+        """
+
+        if renew or self.personalLibraryId is None:
+            libId = None
+            for el in self.listLibraries()["elements"]:
+                if "UR_" in el["libraryId"] or "URH_" in el["libraryId"]:
+                    libId = el["libraryId"]
+                    break
+            assert libId is not None, "Could not identify library id."
+            self.personalLibraryId = libId
+
+        return self.personalLibraryId
 
     def genMailingList(self, listName):
         """Generate mailing list
@@ -257,29 +459,19 @@ class cornellQualtrics:
 
         """
 
-        # first we need to figure out what our personal library id is
-        tmp = requests.get(
-            "https://{0}{1}libraries".format(self.dataCenter, self.qualtricsapi),
-            headers=self.headers_tokenOnly,
-        )
-
-        libId = None
-        for el in tmp.json()["result"]["elements"]:
-            if "UR_" in el["libraryId"] or "URH_" in el["libraryId"]:
-                libId = el["libraryId"]
-                break
-        assert libId is not None, "Could not identify library id."
+        data = {"libraryId": self.getPersonalLibraryId(), "name": listName}
 
-        data = {"libraryId": libId, "name": listName}
-
-        response = requests.post(
-            "https://{0}{1}mailinglists".format(self.dataCenter, self.qualtricsapi),
+        response = self.session.post(
+            f"{self.apiUrl}mailinglists",
             headers=self.headers_post,
             json=data,
         )
         assert response.status_code == 200, "Could not create mailing list."
 
-        return response.json()["result"]["id"]
+        mailingListId = response.json()["result"]["id"]
+        self.mailingListIds.setdefault(listName, mailingListId)
+
+        return mailingListId
 
     def getListContacts(self, mailingListId):
         """Get all contacts in a mailing list
@@ -297,12 +489,8 @@ class cornellQualtrics:
 
 
         """
-        response = requests.get(
-            "https://{0}{2}mailinglists/{1}/contacts".format(
-                self.dataCenter,
-                mailingListId,
-                self.qualtricsapi,
-            ),
+        response = self.session.get(
+            f"{self.apiUrl}mailinglists/{mailingListId}/contacts",
             headers=self.headers_tokenOnly,
         )
 
@@ -313,7 +501,7 @@ class cornellQualtrics:
         out = response.json()["result"]["elements"]
 
         while response.json()["result"]["nextPage"] is not None:
-            response = requests.get(
+            response = self.session.get(
                 response.json()["result"]["nextPage"], headers=self.headers_tokenOnly
             )
             out += response.json()["result"]["elements"]
@@ -337,6 +525,8 @@ class cornellQualtrics:
 
         """
 
+        import pandas
+
         contacts = self.getListContacts(mailingListId)
 
         fn = []
@@ -383,9 +573,7 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{2}mailinglists/{1}/contacts".format(
-            self.dataCenter, mailingListId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}mailinglists/{mailingListId}/contacts"
 
         data = {
             "firstName": firstName,
@@ -393,9 +581,31 @@ class cornellQualtrics:
             "email": email,
         }
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200, "Could not add contact to list."
 
+    def addListContacts(self, mailingListId, contacts, maxWorkers=8):
+        """Add multiple contacts to a mailing list concurrently
+
+        Args:
+            mailingListId (str):
+                Unique id string of mailing lists.  Get either from we interface or via
+                getMailingListId
+            contacts (iterable):
+                Tuples of (firstName, lastName, email) for each contact
+            maxWorkers (int):
+                Maximum number of simultaneous requests. Defaults to 8.
+
+        Returns:
+            None
+
+        """
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            list(
+                executor.map(lambda c: self.addListContact(mailingListId, *c), contacts)
+            )
+
     def deleteListContact(self, mailingListId, contactId):
         """Add a contact to a mailing list
 
@@ -414,17 +624,37 @@ class cornellQualtrics:
 
         """
 
-        response = requests.delete(
-            "https://{0}{3}mailinglists/{1}/contacts/{2}".format(
-                self.dataCenter,
-                mailingListId,
-                contactId,
-                self.qualtricsapi,
-            ),
+        response = self.session.delete(
+            f"{self.apiUrl}mailinglists/{mailingListId}/contacts/{contactId}",
             headers=self.headers_post,
         )
         assert response.status_code == 200, "Could not remove contact from list."
 
+    def deleteListContacts(self, mailingListId, contactIds, maxWorkers=8):
+        """Remove multiple contacts from a mailing list concurrently
+
+        Args:
+            mailingListId (str):
+                Unique id string of mailing lists.  Get either from we interface or via
+                getMailingListId
+            contactIds (iterable):
+                Unique id strings of contacts to remove (as returned by
+                getListContacts)
+            maxWorkers (int):
+                Maximum number of simultaneous requests. Defaults to 8.
+
+        Returns:
+            None
+
+        """
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            list(
+                executor.map(
+                    lambda c: self.deleteListContact(mailingListId, c), contactIds
+                )
+            )
+
     def genDistribution(self, surveyId, mailingListId):
         """Create a survey distribution for the given mailing list
 
@@ -446,33 +676,30 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}distributions".format(
-            self.dataCenter, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}distributions"
 
         data = {
             "surveyId": surveyId,
             "linkType": "Individual",
-            "description": "distribution %s"
-            % datetime.now().strftime("%Y-%m-%dT%H:%M:%S%Z"),
+            "description": "distribution %s" % time.strftime("%Y-%m-%dT%H:%M:%S%Z"),
             "action": "CreateDistribution",
             "mailingListId": mailingListId,
         }
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200
 
         distributionId = response.json()["result"]["id"]
 
-        baseUrl2 = "https://{0}{3}distributions/{1}/links?" "surveyId={2}".format(
-            self.dataCenter, distributionId, surveyId, self.qualtricsapi
+        baseUrl2 = (
+            f"{self.apiUrl}distributions/{distributionId}/links?surveyId={surveyId}"
         )
-        response2 = requests.get(baseUrl2, headers=self.headers_tokenOnly)
+        response2 = self.session.get(baseUrl2, headers=self.headers_tokenOnly)
 
         out = response2.json()["result"]["elements"]
 
         while response2.json()["result"]["nextPage"] is not None:
-            response2 = requests.get(
+            response2 = self.session.get(
                 response2.json()["result"]["nextPage"], headers=self.headers_tokenOnly
             )
             out += response2.json()["result"]["elements"]
@@ -499,11 +726,11 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}distributions/{2}/links?surveyId={3}".format(
-            self.dataCenter, self.qualtricsapi, distributionId, surveyId
+        baseUrl = (
+            f"{self.apiUrl}distributions/{distributionId}/links?surveyId={surveyId}"
         )
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert response.status_code == 200
 
         return response.json()["result"]["elements"]
@@ -547,9 +774,7 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}distributions".format(
-            self.dataCenter, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}distributions"
 
         msg = (
             """<p>{}</p>\n\n""".format(cmsg)
@@ -575,7 +800,7 @@ class cornellQualtrics:
             "sendDate": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
         }
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200
 
         return response.json()["result"]["id"]
@@ -616,9 +841,7 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}distributions/{2}/reminders".format(
-            self.dataCenter, self.qualtricsapi, distributionId
-        )
+        baseUrl = f"{self.apiUrl}distributions/{distributionId}/reminders"
 
         data = {
             "message": {"libraryId": libraryId, "messageId": messageId},
@@ -631,7 +854,7 @@ class cornellQualtrics:
             "sendDate": sendDate.replace(tzinfo=None).isoformat() + "Z",
         }
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200
 
         return response.json()["result"]["distributionId"]
@@ -653,11 +876,9 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}distributions?surveyId={2}".format(
-            self.dataCenter, self.qualtricsapi, surveyId
-        )
+        baseUrl = f"{self.apiUrl}distributions?surveyId={surveyId}"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert response.status_code == 200
 
         return response.json()["result"]["elements"]
@@ -681,16 +902,16 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}distributions/{2}?surveyId={3}".format(
-            self.dataCenter, self.qualtricsapi, distributionId, surveyId
-        )
+        baseUrl = f"{self.apiUrl}distributions/{distributionId}?surveyId={surveyId}"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert response.status_code == 200
 
         return response.json()["result"]
 
-    def exportSurvey(self, surveyId, fileFormat="csv", useLabels="true", saveDir=None):
+    def exportSurvey(
+        self, surveyId, fileFormat="csv", useLabels="true", saveDir=None, timeout=600
+    ):
         """Download and extract survey results
 
         Args:
@@ -703,6 +924,9 @@ class cornellQualtrics:
                 Use choice labels ("true" or "false", defaults "true")
             saveDir (str):
                 Full path to save location.  If None (default) uses system tmp dir
+            timeout (float):
+                Maximum time (in seconds) to wait for Qualtrics to prepare the export.
+                Defaults to 600.
 
         Returns:
             str:
@@ -725,24 +949,20 @@ class cornellQualtrics:
         # Setting static parameters
         # requestCheckProgress = 0.0
         progressStatus = "inProgress"
-        baseUrl = "https://{0}{2}surveys/{1}/export-responses/".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}surveys/{surveyId}/export-responses/"
 
         # Step 1: Creating Data Export
         downloadRequestUrl = baseUrl
         downloadRequestPayload = '{{"useLabels":{0}, "format":"{1}"}}'.format(
             useLabels, fileFormat
         )
-        downloadRequestResponse = requests.request(
-            "POST",
+        downloadRequestResponse = self.session.post(
             downloadRequestUrl,
             data=downloadRequestPayload,
             headers=self.headers_post,
         )
         if downloadRequestResponse.status_code == 500:
-            downloadRequestResponse = requests.request(
-                "POST",
+            downloadRequestResponse = self.session.post(
                 downloadRequestUrl,
                 data=downloadRequestPayload,
                 headers=self.headers_post,
@@ -753,16 +973,24 @@ class cornellQualtrics:
         print("Qualtrics download started.")
 
         # Step 2: Checking on Data Export Progress and waiting until export is ready
+        # back off between checks so that long exports aren't polled continuously
+        delay = 0.25
+        deadline = time.time() + timeout
         while progressStatus != "complete" and progressStatus != "failed":
             # print ("progressStatus=", progressStatus)
             requestCheckUrl = baseUrl + progressId
-            requestCheckResponse = requests.request(
-                "GET", requestCheckUrl, headers=self.headers_tokenOnly
+            requestCheckResponse = self.session.get(
+                requestCheckUrl, headers=self.headers_tokenOnly
             )
             # requestCheckProgress = \
             #    requestCheckResponse.json()["result"]["percentComplete"]
             # print("Download is " + str(requestCheckProgress) + " complete")
             progressStatus = requestCheckResponse.json()["result"]["status"]
+            if progressStatus not in ["complete", "failed"]:
+                if time.time() > deadline:
+                    raise TimeoutError("export did not complete in %d s" % timeout)
+                time.sleep(delay)
+                delay = min(delay * 1.5, 2.0)
 
         # step 2.1: Check for error
         if progressStatus == "failed":
@@ -772,25 +1000,70 @@ class cornellQualtrics:
 
         fileId = requestCheckResponse.json()["result"]["fileId"]
 
-        # Step 3: Downloading file
+        # Step 3: Downloading file to disk in chunks
         requestDownloadUrl = baseUrl + fileId + "/file"
-        requestDownload = requests.request(
-            "GET", requestDownloadUrl, headers=self.headers_post, stream=True
-        )
+        with self.session.get(
+            requestDownloadUrl, headers=self.headers_post, stream=True
+        ) as requestDownload, tempfile.NamedTemporaryFile(
+            suffix=".zip", delete=False
+        ) as f:
+            for chunk in requestDownload.iter_content(chunk_size=65536):
+                f.write(chunk)
+            zipf = f.name
 
         # Step 4: Unzipping the file
         if saveDir is None:
             saveDir = os.path.join(tempfile.gettempdir(), surveyId)
-        zipfile.ZipFile(io.BytesIO(requestDownload.content)).extractall(saveDir)
+        try:
+            with zipfile.ZipFile(zipf) as z:
+                z.extractall(saveDir)
+        finally:
+            os.unlink(zipf)
 
         return saveDir
 
-    def createSurvey(self, surveyname):
+    def exportSurveys(self, surveyIds, maxWorkers=5, **kwargs):
+        """Download and extract results of multiple surveys concurrently
+
+        Args:
+            surveyIds (list):
+                Unique id strings of surveys
+            maxWorkers (int):
+                Maximum number of simultaneous exports (default 5)
+            **kwargs:
+                Any other keywords are passed to
+                :py:meth:`cornellGrading.cornellQualtrics.exportSurvey`
+
+        Returns:
+            list:
+                Full paths to directories where unzipped files will be, matched to
+                the ordering of surveyIds
+
+        Notes:
+            Most of the time of an export is spent waiting for Qualtrics to prepare
+            the file, so running several exports at once takes about as long as the
+            slowest of them.
+
+        """
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            saveDirs = list(
+                executor.map(lambda sId: self.exportSurvey(sId, **kwargs), surveyIds)
+            )
+
+        return saveDirs
+
+    def createSurvey(self, surveyname, renew=False):
         """Create a new survey
 
         Args:
             surveyname (str):
                 Name of survey
+            renew (bool):
+                Renew stored list of surveys before checking that surveyname does not
+                already exist (default False). The stored list is updated with every
+                survey created by this object, so this is only needed if surveys
+                may have been created elsewhere since it was last listed.
 
         Returns:
             str:
@@ -804,26 +1077,30 @@ class cornellQualtrics:
 
         """
 
-        res = self.getSurveyNames()
+        if renew:
+            self.listSurveys()
 
-        assert surveyname not in res, "Survey with that name already exists."
+        assert (
+            surveyname not in self.surveyname2id
+        ), "Survey with that name already exists."
 
-        baseUrl = "https://{0}{1}survey-definitions".format(
-            self.dataCenter, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions"
 
         data = {"SurveyName": surveyname, "Language": "EN", "ProjectCategory": "CORE"}
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
 
-        try:
-            assert response.status_code == 200
-        except AssertionError:
-            print("Survey create failed.")
-            print(response.text)
+        assert response.status_code == 200, "Survey create failed: {}".format(
+            response.text
+        )
 
         surveyId = response.json()["result"]["SurveyID"]
 
+        # keep the stored survey list current without re-listing
+        self.surveyNames = np.append(self.surveyNames, surveyname)
+        self.surveyIds = np.append(self.surveyIds, surveyId)
+        self.surveyname2id[surveyname] = surveyId
+
         return surveyId
 
     def shareSurvey(self, surveyId, sharewith):
@@ -839,53 +1116,14 @@ class cornellQualtrics:
         Notes:
         """
 
-        baseUrl = "https://{0}{2}surveys/{1}/permissions/" "collaborations".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}surveys/{surveyId}/permissions/collaborations"
 
         data = {
             "userId": sharewith,
-            "permissions": {
-                "surveyDefinitionManipulation": {
-                    "copySurveyQuestions": False,
-                    "editSurveyFlow": False,
-                    "useBlocks": False,
-                    "useSkipLogic": False,
-                    "useConjoint": False,
-                    "useTriggers": False,
-                    "useQuotas": False,
-                    "setSurveyOptions": False,
-                    "editQuestions": False,
-                    "deleteSurveyQuestions": False,
-                    "useTableOfContents": False,
-                    "useAdvancedQuotas": False,
-                },
-                "surveyManagement": {
-                    "editSurveys": False,
-                    "activateSurveys": False,
-                    "deactivateSurveys": False,
-                    "copySurveys": False,
-                    "distributeSurveys": False,
-                    "deleteSurveys": False,
-                    "translateSurveys": False,
-                },
-                "response": {
-                    "editSurveyResponses": False,
-                    "createResponseSets": False,
-                    "viewResponseId": True,
-                    "useCrossTabs": True,
-                    "useScreenouts": True,
-                },
-                "result": {
-                    "downloadSurveyResults": True,
-                    "viewSurveyResults": True,
-                    "filterSurveyResults": True,
-                    "viewPersonalData": True,
-                },
-            },
+            "permissions": self.sharePermissions,
         }
 
-        tmp = requests.post(baseUrl, headers=self.headers_post, json=data)
+        tmp = self.session.post(baseUrl, headers=self.headers_post, json=data)
         assert tmp.status_code == 200, "Could not share survey."
 
     def getSurvey(self, surveyId):
@@ -901,17 +1139,39 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{2}survey-definitions/{1}".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert response.status_code == 200, "Could not get surveyId: {}".format(
             surveyId
         )
 
         return response.json()["result"]
 
+    def getSurveyResponseCounts(self, surveyId):
+        """Get the number of responses recorded for a survey
+
+        Args:
+            surveyId (str):
+                Survey ID string as returned by getSurveyId
+
+        Returns:
+            dict:
+                auditable (int): Number of recorded responses
+                generated (int): Number of generated test responses
+                deleted (int): Number of deleted responses
+
+        """
+
+        baseUrl = f"{self.apiUrl}surveys/{surveyId}"
+
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
+        assert response.status_code == 200, "Could not get surveyId: {}".format(
+            surveyId
+        )
+
+        return response.json()["result"]["responseCounts"]
+
     def deleteSurvey(self, surveyId):
         """Delete a Survey
 
@@ -924,11 +1184,9 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{2}survey-definitions/{1}".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}"
 
-        response = requests.delete(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.delete(baseUrl, headers=self.headers_tokenOnly)
 
         assert response.status_code == 200, "Could not delete surveyId: {}".format(
             surveyId
@@ -948,13 +1206,11 @@ class cornellQualtrics:
 
         s = self.getSurvey(surveyId)
 
-        baseUrl = "https://{0}{2}survey-definitions/{1}/versions".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/versions"
 
         data = {"Description": s["SurveyName"], "Published": True}
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200, "Could not publish."
 
     def activateSurvey(self, surveyId):
@@ -968,15 +1224,13 @@ class cornellQualtrics:
             None
 
         """
-        baseUrl = "https://{0}{2}surveys/{1}".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}surveys/{surveyId}"
 
         data = {
             "isActive": True,
         }
 
-        response = requests.put(baseUrl, json=data, headers=self.headers_put)
+        response = self.session.put(baseUrl, json=data, headers=self.headers_put)
         assert response.status_code == 200, "Could not activate."
 
     def makeSurveyPrivate(self, surveyId):
@@ -994,11 +1248,9 @@ class cornellQualtrics:
         data = self.getSurveyOptions(surveyId)
         data["SurveyProtection"] = "ByInvitation"
 
-        baseUrl = "https://{0}{2}survey-definitions/{1}/options".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/options"
 
-        response = requests.put(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.put(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200, "Could not update options."
 
     def getSurveyOptions(self, surveyId):
@@ -1014,10 +1266,8 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{2}survey-definitions/{1}/options".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/options"
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
 
         return response.json()["result"]
 
@@ -1034,11 +1284,9 @@ class cornellQualtrics:
             None
 
         """
-        baseUrl = "https://{0}{2}survey-definitions/{1}/options".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/options"
 
-        response = requests.put(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.put(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200, "Could not update options."
 
     def addSurveyQuestion(self, surveyId, questionDef):
@@ -1055,15 +1303,82 @@ class cornellQualtrics:
                 Question ID
 
         """
-        baseUrl = "https://{0}{2}survey-definitions/{1}/questions".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/questions"
 
-        response = requests.post(baseUrl, json=questionDef, headers=self.headers_post)
+        response = self.session.post(
+            baseUrl, json=questionDef, headers=self.headers_post
+        )
         assert response.status_code == 200, "Couldn't add question."
 
         return response.json()["result"]["QuestionID"]
 
+    def addSurveyQuestions(self, surveyId, questionDefs, maxWorkers=4):
+        """Add multiple questions to existing Survey concurrently
+
+        Args:
+            surveyId (str):
+                Survey ID string as returned by getSurveyId
+            questionDefs (list):
+                Full question definition dictionaries, in the order they should
+                appear in the survey
+            maxWorkers (int):
+                Maximum number of simultaneous requests. Defaults to 4.
+
+        Returns:
+            list:
+                Question IDs (str), matched to the ordering of questionDefs
+
+        Notes:
+            Questions are appended to the survey's default block in the order that
+            Qualtrics receives them, so after all are added, the block is reordered to
+            match questionDefs.
+
+        """
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            qIds = list(
+                executor.map(
+                    lambda q: self.addSurveyQuestion(surveyId, q), questionDefs
+                )
+            )
+
+        if len(qIds) > 1:
+            self.reorderBlockQuestions(surveyId, qIds)
+
+        return qIds
+
+    def reorderBlockQuestions(self, surveyId, qIds):
+        """Set the order of questions in a Survey's default block
+
+        Args:
+            surveyId (str):
+                Survey ID string as returned by getSurveyId
+            qIds (list):
+                Question ID strings in the desired order. Any other elements of the
+                block are kept, ahead of these questions.
+
+        Returns:
+            None
+
+        """
+
+        s = self.getSurvey(surveyId)
+        blockId, block = None, None
+        for bId, b in s["Blocks"].items():
+            if b["Type"] == "Default":
+                blockId, block = bId, b
+                break
+        assert blockId is not None, "Could not find default block."
+
+        block["BlockElements"] = [
+            el for el in block["BlockElements"] if el.get("QuestionID") not in qIds
+        ] + [{"Type": "Question", "QuestionID": q} for q in qIds]
+
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/blocks/{blockId}"
+
+        response = self.session.put(baseUrl, json=block, headers=self.headers_post)
+        assert response.status_code == 200, "Couldn't reorder questions."
+
     def updateSurveyQuestion(self, surveyId, qId, questionDef):
         """Add question to existing Survey
 
@@ -1079,11 +1394,11 @@ class cornellQualtrics:
             None
 
         """
-        baseUrl = "https://{0}{2}survey-definitions/{1}/questions/{3}".format(
-            self.dataCenter, surveyId, self.qualtricsapi, qId
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/questions/{qId}"
 
-        response = requests.put(baseUrl, json=questionDef, headers=self.headers_post)
+        response = self.session.put(
+            baseUrl, json=questionDef, headers=self.headers_post
+        )
         assert response.status_code == 200, "Couldn't update question."
 
     def getSurveyQuotas(self, surveyId):
@@ -1098,11 +1413,9 @@ class cornellQualtrics:
                 Dictionary of quotas (response.json()['result'])
 
         """
-        baseUrl = "https://{0}{2}survey-definitions/{1}/quotas".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/quotas"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert (
             response.status_code == 200
         ), "Could not get quotas for surveyId: {}".format(surveyId)
@@ -1121,11 +1434,9 @@ class cornellQualtrics:
                  Quota ids (response.json()['result']["elements"][0]["Quotas"])
 
         """
-        baseUrl = "https://{0}{2}survey-definitions/{1}/quotagroups".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/quotagroups"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert (
             response.status_code == 200
         ), "Could not get quotas for surveyId: {}".format(surveyId)
@@ -1146,13 +1457,11 @@ class cornellQualtrics:
                 Quota Group ID
 
         """
-        baseUrl = "https://{0}{2}survey-definitions/{1}/quotagroups".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/quotagroups"
 
         data = {"Name": quotaGroupName, "Public": False, "MultipleMatch": "PlaceInAll"}
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200, "Couldn't add quota group."
 
         return response.json()["result"]["QuotaGroupID"]
@@ -1171,11 +1480,9 @@ class cornellQualtrics:
                 Quota ID
 
         """
-        baseUrl = "https://{0}{2}survey-definitions/{1}/quotas".format(
-            self.dataCenter, surveyId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}survey-definitions/{surveyId}/quotas"
 
-        response = requests.post(baseUrl, json=quotaDef, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=quotaDef, headers=self.headers_post)
         assert response.status_code == 200, "Couldn't add quota."
 
         return response.json()["result"]["QuotaID"]
@@ -1192,9 +1499,9 @@ class cornellQualtrics:
 
         """
 
-        baseUrl = "https://{0}{1}libraries".format(self.dataCenter, self.qualtricsapi)
+        baseUrl = f"{self.apiUrl}libraries"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert response.status_code == 200, "Could not get libraries."
 
         return response.json()["result"]
@@ -1211,11 +1518,9 @@ class cornellQualtrics:
                 message dictionaries
 
         """
-        baseUrl = "https://{0}{2}libraries/{1}/messages".format(
-            self.dataCenter, libraryId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}libraries/{libraryId}/messages"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert response.status_code == 200, "Couldn't get messages"
 
         return response.json()["result"]["elements"]
@@ -1234,11 +1539,9 @@ class cornellQualtrics:
                 message contents
 
         """
-        baseUrl = "https://{0}{2}libraries/{1}/messages/{3}".format(
-            self.dataCenter, libraryId, self.qualtricsapi, messageId
-        )
+        baseUrl = f"{self.apiUrl}libraries/{libraryId}/messages/{messageId}"
 
-        response = requests.get(baseUrl, headers=self.headers_tokenOnly)
+        response = self.session.get(baseUrl, headers=self.headers_tokenOnly)
         assert response.status_code == 200, "Couldn't get messages"
 
         return response.json()["result"]
@@ -1262,9 +1565,7 @@ class cornellQualtrics:
                 message id
 
         """
-        baseUrl = "https://{0}{2}libraries/{1}/messages".format(
-            self.dataCenter, libraryId, self.qualtricsapi
-        )
+        baseUrl = f"{self.apiUrl}libraries/{libraryId}/messages"
 
         data = {
             "description": subject,
@@ -1272,7 +1573,7 @@ class cornellQualtrics:
             "messages": {"en": msg},
         }
 
-        response = requests.post(baseUrl, json=data, headers=self.headers_post)
+        response = self.session.post(baseUrl, json=data, headers=self.headers_post)
         assert response.status_code == 200, "Couldn't create message."
 
         return response.json()["result"]["id"]
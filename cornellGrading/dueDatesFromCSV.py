@@ -104,12 +104,12 @@ def main():
 
     # Delete old due dates if they exist? Use the "--force" flag.
     if args.force:
-        for o in asgn.get_overrides():
+        for o in asgn.get_overrides(per_page=100):
             print(f"Deleting existing override {o}")
             o.delete()
 
     # Due dates by section
-    secs = c.course.get_sections()
+    secs = c.course.get_sections(per_page=100)
 
     with open(args.csvFileName) as csvfile:
         reader = csv.DictReader(csvfile)
@@ -3,12 +3,18 @@ import re
 import os
 import pdf2image
 import tempfile
+import hashlib
 
 
 class pandocHTMLParser(HTMLParser):
     """Parser for pandoc produced html from LaTeX source"""
 
-    def __init__(self, hwd, upfolder):
+    # patterns for span definitions, equation labels and equation images
+    spanp = re.compile(r"span.(.*?)\s*{(.*?)}")
+    labelp = re.compile(r"\\label{([^}]+)}")
+    eqp = re.compile(r"https://latex.codecogs.com/png.latex\?(.*)")
+
+    def __init__(self, hwd, upfolder, executor=None):
         """Create parser for pandoc html output to reformat for Canvas elements
 
         Args:
@@ -16,6 +22,10 @@ class pandocHTMLParser(HTMLParser):
                 Full path to location of original LaTeX content
             upfolder (canvasapi.folder.Folder):
                 Folder object for uploads
+            executor (concurrent.futures.Executor):
+                If set, image conversions and uploads are submitted to this executor
+                rather than run while parsing.  Call waitForImages after parsing to
+                collect the results.  Defaults None.
 
         Returns:
             None
@@ -28,6 +38,7 @@ class pandocHTMLParser(HTMLParser):
         self.inFigcaption = False  # toggle for inside figure caption
         self.inSpan = False  # toggle for inside span
         self.imagesUploaded = []  # storage for images uploaded
+        self.imageFutures = {}  # storage for pending image uploads
         self.figcaptions = []  # storage for uploaded image captions
         self.figCounter = 1   # increment on figure captions
         self.figLabels = {}    # storage for figure label replacement
@@ -35,13 +46,10 @@ class pandocHTMLParser(HTMLParser):
         self.inOL = False  # toggle for inside ordered list
         self.inNestedOL = False  # toggle for inside nested ordered list
 
-        # define regex and dict for storing all span definitions
-        self.spanp = re.compile(r"span.(.*?)\s*{(.*?)}")
+        # dict for storing all span definitions
         self.spanDefs = {}
 
-        # define regex and dict for handling equations
-        self.labelp = re.compile(r"\\label{([^}]+)}")
-        self.eqp = re.compile(r"https://latex.codecogs.com/png.latex\?(.*)")
+        # dict for handling equations
         self.eqlabels = {}  # key is label, value is tuple of eq num and orig full label
         self.eqcounter = 1
 
@@ -49,6 +57,7 @@ class pandocHTMLParser(HTMLParser):
         self.hwd = hwd
         self.tmpdir = tempfile.gettempdir()
         self.upfolder = upfolder
+        self.executor = executor
 
     def handle_starttag(self, tag, attrs):
         if tag == "body":
@@ -65,48 +74,12 @@ class pandocHTMLParser(HTMLParser):
 
             # anyting that's not a link must be an actual image
             if not (imsrc.startswith("http")):
-                # if you don't see it in the source directory, it's probably a
-                # PDF and needs to be converted to PNG
-                if not (os.path.exists(os.path.join(self.hwd, imsrc))):
-                    # look for the pdf of this image
-                    imf = os.path.join(
-                        self.hwd, imsrc.split(os.extsep)[0] + os.extsep + "pdf"
-                    )
-                    if not os.path.exists(imf):
-                        imf = os.path.join(
-                            self.hwd,
-                            imsrc.split(os.extsep)[0]
-                            + "-eps-converted-to"
-                            + os.extsep
-                            + "pdf",
-                        )
-                    assert os.path.exists(imf), (
-                        "Original image file not found for %s" % imsrc
-                    )
-
-                    pilim = pdf2image.convert_from_path(
-                        imf,
-                        dpi=150,
-                        output_folder=None,
-                        fmt="png",
-                        use_cropbox=False,
-                        strict=False,
+                if self.executor is None:
+                    self.imagesUploaded.append(self.uploadImage(imsrc))
+                elif imsrc not in self.imageFutures:
+                    self.imageFutures[imsrc] = self.executor.submit(
+                        self.uploadImage, imsrc
                     )
-                    pngf = os.path.join(self.tmpdir, imsrc)
-                    pilim[0].save(pngf)
-                    assert os.path.exists(pngf), "Cannot locate png output %s" % pngf
-                else:
-                    pngf = os.path.join(self.hwd, imsrc)
-
-                # push PNG up into the HW folder
-                res = self.upfolder.upload(pngf)
-                assert res[0], "Imag upload failed: %s" % pngf
-                self.imagesUploaded.append(
-                    {
-                        "orig": imsrc,
-                        "url": res[1]["preview_url"].split("/file_preview")[0],
-                    }
-                )
             else:
                 # if we're here, we're probably in an equation
                 # let's look for label directives in equations
@@ -127,6 +100,73 @@ class pandocHTMLParser(HTMLParser):
         if tag == "style":
             self.inStyle = True
 
+    def uploadImage(self, imsrc):
+        """Convert image to PNG (if needed) and upload
+
+        Args:
+            imsrc (str):
+                Image source, relative to the LaTeX source directory
+
+        Returns:
+            dict:
+                orig (str): imsrc
+                url (str): Canvas url of uploaded image
+
+        """
+
+        # if you don't see it in the source directory, it's probably a
+        # PDF and needs to be converted to PNG
+        if not (os.path.exists(os.path.join(self.hwd, imsrc))):
+            # look for the pdf of this image
+            imf = os.path.join(self.hwd, imsrc.split(os.extsep)[0] + os.extsep + "pdf")
+            if not os.path.exists(imf):
+                imf = os.path.join(
+                    self.hwd,
+                    imsrc.split(os.extsep)[0] + "-eps-converted-to" + os.extsep + "pdf",
+                )
+            assert os.path.exists(imf), "Original image file not found for %s" % imsrc
+
+            # render only the first page, written by poppler directly as png.  The
+            # output name is unique to imsrc so that concurrent conversions of images
+            # sharing a stem (e.g. fig.v1.png and fig.v2.png) don't collide
+            pngf = os.path.join(self.tmpdir, imsrc)
+            outf = pdf2image.convert_from_path(
+                imf,
+                dpi=150,
+                output_folder=self.tmpdir,
+                fmt="png",
+                use_cropbox=False,
+                strict=False,
+                single_file=True,
+                output_file=hashlib.sha1(imsrc.encode()).hexdigest(),
+                paths_only=True,
+            )[0]
+            os.replace(outf, pngf)
+            assert os.path.exists(pngf), "Cannot locate png output %s" % pngf
+        else:
+            pngf = os.path.join(self.hwd, imsrc)
+
+        # push PNG up into the HW folder
+        res = self.upfolder.upload(pngf)
+        assert res[0], "Imag upload failed: %s" % pngf
+
+        return {"orig": imsrc, "url": res[1]["preview_url"].split("/file_preview")[0]}
+
+    def waitForImages(self):
+        """Wait for all submitted image uploads and store their results
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+
+        for f in self.imageFutures.values():
+            self.imagesUploaded.append(f.result())
+        self.imageFutures = {}
+
     def handle_endtag(self, tag):
         if tag == "body":
             self.inBody = False
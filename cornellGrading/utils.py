@@ -53,3 +53,49 @@ def convlatex(texstr):
     )
 
     return qtxt
+
+
+def readSurveyCSV(surveyfile, questionPattern):
+    """Read a Qualtrics csv export, parsing only some of its columns
+
+    Args:
+        surveyfile (str):
+            Full path to csv export (with the standard three header rows)
+        questionPattern (str):
+            Regular expression matched against the question text (second header
+            row). Matching columns, along with any RecipientEmail column, are
+            parsed.
+
+    Returns:
+        pandas.DataFrame:
+            Survey responses, with the three header rows as a column MultiIndex
+            (as with pandas.read_csv(surveyfile, header=[0, 1, 2]))
+
+    Notes:
+        pandas does not allow usecols together with a multi-row header, so the
+        header rows are read first, and the body is then read without a header and
+        the column MultiIndex rebuilt from the header rows.
+
+    """
+
+    import pandas
+
+    header = pandas.read_csv(surveyfile, header=None, nrows=3, dtype=str)
+    keep = (header.iloc[0] == "RecipientEmail") | header.iloc[1].str.contains(
+        questionPattern, na=False
+    )
+    usecols = [j for j, k in enumerate(keep) if k]
+
+    # naming all columns keeps this working when there are no responses
+    out = pandas.read_csv(
+        surveyfile,
+        header=None,
+        names=list(header.columns),
+        skiprows=3,
+        usecols=usecols,
+    )
+    out.columns = pandas.MultiIndex.from_arrays(
+        [header.iloc[k, usecols].values for k in range(3)]
+    )
+
+    return out
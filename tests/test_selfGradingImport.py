@@ -0,0 +1,162 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas
+
+from cornellGrading import cornellGrading
+from cornellGrading.utils import readSurveyCSV
+
+
+def writeSurvey(path, private=False, extraCredit=True, nrows=3):
+    """Write a synthetic Qualtrics csv export
+
+    Args:
+        path (str):
+            Full path to output file
+        private (bool):
+            Identify respondents by RecipientEmail rather than a netid question
+        extraCredit (bool):
+            Include an extra credit question
+        nrows (int):
+            Number of responses
+
+    Returns:
+        None
+
+    """
+
+    names = ["StartDate", "IPAddress", "Q1" if not private else "RecipientEmail"]
+    text = [
+        "Start Date",
+        "IP Address\n(with a line break)",
+        "Enter your netid" if not private else "Recipient Email",
+    ]
+    names += ["Q2", "Q3"]
+    text += ["Question 1 Score", "Question 2 Score"]
+    if extraCredit:
+        names += ["Q4"]
+        text += ["Question 3 (Extra Credit) Score"]
+
+    netids = ["AB12", "cd34", "ef56", "gh78"][:nrows]
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(names)
+        w.writerow(text)
+        w.writerow([json.dumps({"ImportId": n}) for n in names])
+        for j, n in enumerate(netids):
+            row = ["2024-01-01 10:00:00", "1.2.3.4"]
+            row += [n.lower() + "@cornell.edu" if private else n]
+            row += [j % 4, 3]
+            if extraCredit:
+                row += [(j + 1) % 4]
+            w.writerow(row)
+
+
+class TestReadSurveyCSV(unittest.TestCase):
+    """Tests for cornellGrading.utils.readSurveyCSV"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_matchesFullRead(self):
+        for private in [False, True]:
+            surveyfile = os.path.join(self.tmpdir, "survey.csv")
+            writeSurvey(surveyfile, private=private)
+
+            out = readSurveyCSV(surveyfile, "Enter your netid|Score")
+            full = pandas.read_csv(surveyfile, header=[0, 1, 2])
+            # everything but the start date and IP address
+            expected = full.iloc[:, 2:]
+
+            self.assertEqual(list(out.columns), list(expected.columns))
+            np.testing.assert_array_equal(out.values, expected.values)
+
+    def test_noResponses(self):
+        surveyfile = os.path.join(self.tmpdir, "survey.csv")
+        writeSurvey(surveyfile, nrows=0)
+
+        out = readSurveyCSV(surveyfile, "Enter your netid|Score")
+        self.assertEqual(out.shape, (0, 4))
+
+
+class TestSelfGradingImport(unittest.TestCase):
+    """Tests for cornellGrading.selfGradingImport without Canvas or Qualtrics"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+        c = cornellGrading.__new__(cornellGrading)
+        c.coursename = "TEST 1000"
+        c.names = np.array(["B, A", "D, C", "F, E"])
+        c.ids = np.array([1, 2, 3])
+        c.netids = np.array(["ab12", "cd34", "ef56"])
+        c.id2netid = dict(zip(c.ids.tolist(), c.netids.tolist()))
+        c.qualtrics = mock.Mock()
+        self.c = c
+
+        due = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        subs = [
+            # on time, late (penalized), very late (zero)
+            SimpleNamespace(user_id=1, submitted_at="2024-01-01T11:00:00Z", late=False),
+            SimpleNamespace(user_id=2, submitted_at="2024-01-02T12:00:00Z", late=True),
+            SimpleNamespace(user_id=3, submitted_at="2024-01-06T12:00:00Z", late=True),
+        ]
+        self.hw = mock.Mock(due_at_date=due, points_possible=10)
+        self.hw.get_submissions.return_value = subs
+        c.getAssignment = mock.Mock(return_value=self.hw)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def runImport(self, **kwargs):
+        surveyfile = os.path.join(self.tmpdir, "survey.csv")
+        writeSurvey(surveyfile, **kwargs)
+        self.c.exportSurveyCSV = mock.Mock(return_value=surveyfile)
+
+        return self.c.selfGradingImport(1, noUpload=True)
+
+    def test_scores(self):
+        for private in [False, True]:
+            netids, scores, _ = self.runImport(private=private)
+
+            np.testing.assert_array_equal(netids, ["ab12", "cd34", "ef56"])
+            # regular: (j + 3)/3/2*10, extra credit: (j + 1)/3*3
+            expected = np.array([5.0 + 1.0, 20 / 3.0 + 2.0, 0.0])
+            expected[1] -= 10 * 0.25
+            np.testing.assert_allclose(scores, expected)
+
+    def test_noLateCheck(self):
+        surveyfile = os.path.join(self.tmpdir, "survey.csv")
+        writeSurvey(surveyfile, extraCredit=False)
+        self.c.exportSurveyCSV = mock.Mock(return_value=surveyfile)
+
+        _, scores, _ = self.c.selfGradingImport(1, checkLate=False, noUpload=True)
+        np.testing.assert_allclose(scores, [5.0, 20 / 3.0, 25 / 3.0])
+
+    def test_canvasFailureDoesNotWaitOnExport(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.c.exportSurveyCSV = mock.Mock(side_effect=lambda *a, **k: release.wait())
+        self.hw.get_submissions.side_effect = RuntimeError("canvas is down")
+
+        t0 = time.monotonic()
+        with self.assertRaises(RuntimeError):
+            self.c.selfGradingImport(1, noUpload=True)
+        self.assertLess(time.monotonic() - t0, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()